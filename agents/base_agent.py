@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+import asyncio
+import collections
 import logging
-from pydantic import BaseModel
+from dataclasses import dataclass
+from datetime import datetime
 
-class AgentMessage(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AgentMessage:
     """Standard message format for A2A communication"""
     sender: str
     receiver: str
@@ -19,7 +23,8 @@ class BaseAgent(ABC):
         self.role = role
         self.config = config or {}
         self.logger = logging.getLogger(f"agent.{name}")
-        self.memory = []
+        # Bounded message history; the oldest messages are evicted past memory_limit
+        self.memory = collections.deque(maxlen=self.config.get("memory_limit", 1024))
         
     @abstractmethod
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,14 +40,18 @@ class BaseAgent(ABC):
             content=content,
             timestamp=self._get_timestamp()
         )
-        self.logger.debug(f"Sent message to {receiver}: {message_type}")
+        self.logger.debug("Sent message to %s: %s", receiver, message_type)
         return message
     
     def receive_message(self, message: AgentMessage) -> None:
         """Receive and process message from another agent"""
         self.memory.append(message)
-        self.logger.debug(f"Received message from {message.sender}: {message.message_type}")
+        self.logger.debug("Received message from %s: %s", message.sender, message.message_type)
+    
+    async def _simulate_latency(self, seconds: float) -> None:
+        """Sleep only when the agent is configured to simulate backend latency"""
+        if self.config.get("simulate_latency"):
+            await asyncio.sleep(seconds)
     
     def _get_timestamp(self) -> str:
-        from datetime import datetime
         return datetime.now().isoformat()
\ No newline at end of file
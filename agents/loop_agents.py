@@ -1,7 +1,23 @@
 from .base_agent import BaseAgent
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import asyncio
 import logging
+import numpy as np
+
+# Quality components, in the order their scores are computed
+_COMPONENTS = ("script_quality", "audio_quality", "visual_quality", "engagement_potential")
+
+# Improvement suggestions per quality component
+_SUGGESTIONS = {
+    "script_quality": "Rewrite script with more engaging content and clear structure",
+    "audio_quality": "Improve audio clarity and add background music",
+    "visual_quality": "Enhance visuals with better graphics and transitions",
+    "engagement_potential": "Add hooks and calls to action to improve engagement"
+}
+_DEFAULT_SUGGESTION = "General quality improvement needed"
+
+# Shared immutable result for assessments without issues
+_NO_ISSUES: Tuple[Dict[str, Any], ...] = ()
 
 class QualityValidatorAgent(BaseAgent):
     """Loop agent for quality validation and iterative improvement"""
@@ -10,11 +26,11 @@ class QualityValidatorAgent(BaseAgent):
         super().__init__("quality_validator", "Validate and improve video quality")
         self.quality_threshold = quality_threshold
         self.max_iterations = max_iterations
-        self.iteration_count = 0
         
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute quality validation loop"""
-        video_assets = task.get("video_assets", {})
+        # Copy once so improvements can be applied in place without touching the caller's dict
+        video_assets = dict(task.get("video_assets", {}))
         quality_requirements = task.get("quality_requirements", {})
         
         self.logger.info("Starting quality validation loop")
@@ -26,24 +42,32 @@ class QualityValidatorAgent(BaseAgent):
             "meets_standards": False
         }
         
+        # Iteration state is local so one agent can serve concurrent executions
+        iteration = 0
+        
         # Loop until quality standards are met or max iterations reached
-        while (self.iteration_count < self.max_iterations and 
+        while (iteration < self.max_iterations and 
                not results["meets_standards"]):
             
-            self.iteration_count += 1
-            self.logger.info(f"Quality validation iteration {self.iteration_count}")
+            iteration += 1
+            self.logger.info("Quality validation iteration %d", iteration)
             
             # Assess current quality
             quality_assessment = await self._assess_quality(video_assets, quality_requirements)
             current_score = quality_assessment["overall_score"]
             
             results["final_quality_score"] = current_score
-            results["iterations_performed"] = self.iteration_count
+            results["iterations_performed"] = iteration
             
             # Check if quality meets threshold
             if current_score >= self.quality_threshold:
                 results["meets_standards"] = True
-                self.logger.info(f"Quality standards met with score: {current_score}")
+                self.logger.info("Quality standards met with score: %s", current_score)
+                break
+            
+            # Prevent infinite loops; improvements would never be re-assessed
+            if iteration >= self.max_iterations:
+                self.logger.warning("Max iterations reached. Final quality score: %s", current_score)
                 break
             
             # Generate improvements
@@ -52,13 +76,8 @@ class QualityValidatorAgent(BaseAgent):
             
             # Apply improvements (in real implementation, this would trigger other agents)
             if improvements:
-                self.logger.info(f"Applying {len(improvements)} improvements")
+                self.logger.info("Applying %d improvements", len(improvements))
                 video_assets = await self._apply_improvements(video_assets, improvements)
-            
-            # Prevent infinite loops
-            if self.iteration_count >= self.max_iterations:
-                self.logger.warning(f"Max iterations reached. Final quality score: {current_score}")
-                break
         
         return results
     
@@ -67,98 +86,83 @@ class QualityValidatorAgent(BaseAgent):
         self.logger.debug("Assessing video quality")
         
         # Simulate quality assessment
-        await asyncio.sleep(1)
+        await self._simulate_latency(1)
         
-        scores = {
-            "script_quality": self._score_script(assets.get("script", {})),
-            "audio_quality": self._score_audio(assets.get("audio", {})),
-            "visual_quality": self._score_visuals(assets.get("visuals", {})),
-            "engagement_potential": self._score_engagement(assets)
-        }
-        
-        overall_score = sum(scores.values()) / len(scores)
+        # Component scorers are independent, so run them concurrently
+        score_values = np.fromiter(await asyncio.gather(
+            self._score_script(assets.get("script", {})),
+            self._score_audio(assets.get("audio", {})),
+            self._score_visuals(assets.get("visuals", {})),
+            self._score_engagement(assets)
+        ), dtype=np.float64, count=len(_COMPONENTS))
         
         return {
-            "overall_score": overall_score,
-            "component_scores": scores,
-            "issues_found": self._identify_issues(scores, requirements)
+            "overall_score": float(score_values.mean()),
+            "component_scores": dict(zip(_COMPONENTS, score_values.tolist())),
+            "issues_found": self._identify_issues(score_values, requirements)
         }
     
     async def _generate_improvements(self, assessment: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate improvement suggestions based on quality assessment"""
         issues = assessment.get("issues_found", [])
-        improvements = []
         
-        for issue in issues:
-            improvement = {
+        return [
+            {
                 "component": issue["component"],
                 "issue": issue["description"],
-                "suggestion": self._get_improvement_suggestion(issue),
+                "suggestion": _SUGGESTIONS.get(issue["component"], _DEFAULT_SUGGESTION),
                 "priority": issue.get("severity", "medium")
             }
-            improvements.append(improvement)
-        
-        return improvements
+            for issue in issues
+        ]
     
     async def _apply_improvements(self, assets: Dict[str, Any], improvements: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Apply improvements to assets"""
-        self.logger.info(f"Applying {len(improvements)} improvements")
+        self.logger.info("Applying %d improvements", len(improvements))
         
         # In real implementation, this would trigger specific agents
-        # For now, simulate the improvement process
-        improved_assets = assets.copy()
-        
+        # For now, simulate the improvement process; assets are updated in place
         for improvement in improvements:
             component = improvement["component"]
-            if component in improved_assets:
+            if component in assets:
                 # Mark component as improved
-                improved_assets[f"{component}_improved"] = True
+                assets[f"{component}_improved"] = True
         
-        return improved_assets
+        return assets
     
-    def _score_script(self, script: Dict[str, Any]) -> float:
+    async def _score_script(self, script: Dict[str, Any]) -> float:
         """Score script quality"""
         if not script:
             return 0.3
         # Simple scoring logic - in real implementation, use more sophisticated metrics
         return min(0.3 + len(script.get("scenes", [])) * 0.1, 1.0)
     
-    def _score_audio(self, audio: Dict[str, Any]) -> float:
+    async def _score_audio(self, audio: Dict[str, Any]) -> float:
         """Score audio quality"""
         return 0.7  # Simulated score
     
-    def _score_visuals(self, visuals: Dict[str, Any]) -> float:
+    async def _score_visuals(self, visuals: Dict[str, Any]) -> float:
         """Score visual quality"""
         return 0.6  # Simulated score
     
-    def _score_engagement(self, assets: Dict[str, Any]) -> float:
+    async def _score_engagement(self, assets: Dict[str, Any]) -> float:
         """Score engagement potential"""
         return 0.8  # Simulated score
     
-    def _identify_issues(self, scores: Dict[str, float], requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Identify quality issues"""
-        issues = []
+    def _identify_issues(self, score_values: np.ndarray, requirements: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
+        """Identify quality issues from scores ordered like _COMPONENTS"""
         threshold = requirements.get("min_component_score", 0.7)
+        below = score_values < threshold
         
-        for component, score in scores.items():
-            if score < threshold:
-                issues.append({
-                    "component": component,
-                    "description": f"Low {component} score: {score:.2f}",
-                    "severity": "high" if score < 0.5 else "medium"
-                })
-        
-        return issues
-    
-    def _get_improvement_suggestion(self, issue: Dict[str, Any]) -> str:
-        """Get improvement suggestion for an issue"""
-        component = issue["component"]
-        
-        suggestions = {
-            "script_quality": "Rewrite script with more engaging content and clear structure",
-            "audio_quality": "Improve audio clarity and add background music",
-            "visual_quality": "Enhance visuals with better graphics and transitions",
-            "engagement_potential": "Add hooks and calls to action to improve engagement"
-        }
+        # Happy path: nothing below threshold, share the empty result
+        if not below.any():
+            return _NO_ISSUES
         
-        return suggestions.get(component, "General quality improvement needed")
\ No newline at end of file
+        return tuple(
+            {
+                "component": _COMPONENTS[i],
+                "description": f"Low {_COMPONENTS[i]} score: {score_values[i]:.2f}",
+                "severity": "high" if score_values[i] < 0.5 else "medium"
+            }
+            for i in np.flatnonzero(below)
+        )
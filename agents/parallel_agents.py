@@ -1,6 +1,7 @@
 from .base_agent import BaseAgent
 from typing import Dict, Any, List
 import asyncio
+import collections
 import logging
 
 class ResearchAgent(BaseAgent):
@@ -11,77 +12,113 @@ class ResearchAgent(BaseAgent):
         self.research_type = research_type
     
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
-        topic = task.get("topic", "")
+        results = await self.execute_batch([task])
+        return results[0]
+    
+    async def execute_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Research several topics with a single backend call"""
+        topics = [task.get("topic", "") for task in tasks]
         
-        self.logger.info(f"Researching {self.research_type} for: {topic}")
+        self.logger.info(f"Researching {self.research_type} for: {', '.join(topics)}")
         
         # Simulate different research types
         if self.research_type == "trends":
-            return await self._research_trends(topic)
+            return await self._research_trends(topics)
         elif self.research_type == "facts":
-            return await self._research_facts(topic)
+            return await self._research_facts(topics)
         elif self.research_type == "competition":
-            return await self._research_competition(topic)
+            return await self._research_competition(topics)
         else:
-            return {"error": f"Unknown research type: {self.research_type}"}
+            return [{"error": f"Unknown research type: {self.research_type}"} for _ in topics]
     
-    async def _research_trends(self, topic: str) -> Dict[str, Any]:
+    async def _research_trends(self, topics: List[str]) -> List[Dict[str, Any]]:
         await asyncio.sleep(2)  # Simulate API call
-        return {
-            "trending_angles": [
-                f"Latest developments in {topic}",
-                f"Future of {topic}",
-                f"Controversial aspects of {topic}"
-            ],
-            "search_volume": "High",
-            "competition_level": "Medium"
-        }
+        return [
+            {
+                "trending_angles": [
+                    f"Latest developments in {topic}",
+                    f"Future of {topic}",
+                    f"Controversial aspects of {topic}"
+                ],
+                "search_volume": "High",
+                "competition_level": "Medium"
+            }
+            for topic in topics
+        ]
     
-    async def _research_facts(self, topic: str) -> Dict[str, Any]:
+    async def _research_facts(self, topics: List[str]) -> List[Dict[str, Any]]:
         await asyncio.sleep(1.5)
-        return {
-            "key_facts": [
-                f"Fact 1 about {topic}",
-                f"Fact 2 about {topic}",
-                f"Fact 3 about {topic}"
-            ],
-            "sources": ["Source A", "Source B", "Source C"],
-            "statistics": {"relevance_score": 0.85}
-        }
+        return [
+            {
+                "key_facts": [
+                    f"Fact 1 about {topic}",
+                    f"Fact 2 about {topic}",
+                    f"Fact 3 about {topic}"
+                ],
+                "sources": ["Source A", "Source B", "Source C"],
+                "statistics": {"relevance_score": 0.85}
+            }
+            for topic in topics
+        ]
     
-    async def _research_competition(self, topic: str) -> Dict[str, Any]:
+    async def _research_competition(self, topics: List[str]) -> List[Dict[str, Any]]:
         await asyncio.sleep(2.5)
-        return {
-            "top_videos": [
-                {"title": f"Video 1 about {topic}", "views": "100K"},
-                {"title": f"Video 2 about {topic}", "views": "150K"},
-                {"title": f"Video 3 about {topic}", "views": "80K"}
-            ],
-            "gaps_identified": ["Missing practical examples", "No recent updates"],
-            "success_factors": ["Good storytelling", "Clear explanations"]
-        }
+        return [
+            {
+                "top_videos": [
+                    {"title": f"Video 1 about {topic}", "views": "100K"},
+                    {"title": f"Video 2 about {topic}", "views": "150K"},
+                    {"title": f"Video 3 about {topic}", "views": "80K"}
+                ],
+                "gaps_identified": ["Missing practical examples", "No recent updates"],
+                "success_factors": ["Good storytelling", "Clear explanations"]
+            }
+            for topic in topics
+        ]
 
 class ParallelAgentExecutor:
     """Execute multiple agents in parallel"""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 8):
         self.logger = logging.getLogger("parallel_executor")
+        self.max_concurrency = max_concurrency
     
     async def execute_parallel(self, agents: List[BaseAgent], tasks: List[Dict]) -> Dict[str, Any]:
         """Execute multiple agents in parallel"""
         self.logger.info(f"Executing {len(agents)} agents in parallel")
         
-        # Create tasks for all agents
-        agent_tasks = [
-            agent.execute(task) for agent, task in zip(agents, tasks)
-        ]
+        # Limit how many agents hit their backends at once
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        # Research agents of the same type share one batched backend call
+        pairs = list(zip(agents, tasks))
+        units: List[List[int]] = []
+        batches: Dict[str, List[int]] = collections.defaultdict(list)
+        for i, (agent, _) in enumerate(pairs):
+            if isinstance(agent, ResearchAgent):
+                batches[agent.research_type].append(i)
+            else:
+                units.append([i])
+        units.extend(batches.values())
+        
+        async def _run(indices: List[int]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                agent, task = pairs[indices[0]]
+                if len(indices) > 1:
+                    return await agent.execute_batch([pairs[i][1] for i in indices])
+                return [await agent.execute(task)]
+        
+        # Execute all units concurrently
+        unit_results = await asyncio.gather(*(_run(indices) for indices in units), return_exceptions=True)
         
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*agent_tasks, return_exceptions=True)
+        results: List[Any] = [None] * len(pairs)
+        for indices, unit_result in zip(units, unit_results):
+            for position, i in enumerate(indices):
+                results[i] = unit_result if isinstance(unit_result, Exception) else unit_result[position]
         
         # Process results
         processed_results = {}
-        for i, (agent, result) in enumerate(zip(agents, results)):
+        for (agent, _), result in zip(pairs, results):
             if isinstance(result, Exception):
                 self.logger.error(f"Agent {agent.name} failed: {str(result)}")
                 processed_results[agent.name] = {"error": str(result)}
@@ -1,6 +1,134 @@
 from .base_agent import BaseAgent
-from typing import Dict, Any, List
-import asyncio
+from typing import Dict, Any, List, Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from datetime import datetime
+from string import Template
+import re
+
+# Single-pass topic classifier: "vg" for video-generator topics, "ai" for general AI topics.
+# "agents?" keeps plural topics ("AI agents") in the AI branch, as the old substring check did
+_CATEGORY_RE = re.compile(r"(?P<vg>video generator|ai agent)|(?P<ai>\bai\b|\bagents?\b|automation)", re.I)
+
+# Sentence boundary: whitespace after terminal punctuation. A period is consumed with the
+# whitespace so key points read as before ("A. B" -> ["A", "B"]); "!" and "?" are kept
+_SENTENCE_RE = re.compile(r"\.\s+|(?<=[!?])\s+")
+
+# Static main points per topic category as (point, details, share of total duration)
+_POINTS_VIDEOGEN = (
+    (
+        "Understanding Multi-Agent Architecture",
+        "Multi-agent systems combine multiple specialized AI agents working together. Each agent has specific responsibilities: research, writing, production, and quality control. This distributed approach ensures comprehensive content generation with diverse perspectives and expertise.",
+        0.3
+    ),
+    (
+        "Script Writing and Content Generation",
+        "The script writer agent analyzes research data to create compelling narratives. It structures content logically, creates engaging hooks, develops key points with supporting details, and crafts memorable conclusions. The agent ensures pacing matches video duration and maintains audience engagement throughout.",
+        0.35
+    ),
+    (
+        "Video Production and Assembly",
+        "Once the script is ready, production agents handle visual creation. They generate animated slides, add text overlays, create transitions, and assemble final videos. Quality validation ensures all components meet professional standards before delivery.",
+        0.25
+    ),
+    (
+        "Benefits and Real-World Applications",
+        "Automated video generation saves time and resources. It enables rapid content creation for education, marketing, and entertainment. Multi-agent systems adapt to different topics and styles automatically.",
+        0.1
+    )
+)
+
+_POINTS_AI = (
+    (
+        "What is AI and How Does It Work?",
+        "AI systems learn from data and make intelligent decisions. They process information, identify patterns, and generate insights. Modern AI uses machine learning and neural networks to continuously improve.",
+        0.25
+    ),
+    (
+        "Key Applications in Business",
+        "AI powers automation, analytics, customer service, and content creation. Companies use AI to reduce costs, improve quality, and accelerate innovation. Real-world examples show measurable ROI.",
+        0.35
+    ),
+    (
+        "Challenges and Future Outlook",
+        "AI faces challenges around bias, interpretability, and ethics. Future developments will address these concerns. The AI industry continues to evolve with breakthrough innovations.",
+        0.25
+    ),
+    (
+        "How You Can Get Started",
+        "Learn AI fundamentals through online courses. Start with Python and machine learning libraries. Build projects that solve real problems. Join the AI community and stay updated.",
+        0.15
+    )
+)
+
+# Generic points are substituted with the topic at call time
+_POINTS_GENERIC = (
+    (Template("Introduction to $topic"), Template("Understand the fundamentals of $topic. Learn key concepts and terminology."), 0.25),
+    (Template("Core Principles of $topic"), Template("Explore the main principles and best practices for $topic."), 0.35),
+    (Template("Practical Applications"), Template("See real-world examples of $topic in action."), 0.25),
+    (Template("Next Steps and Resources"), Template("Learn how to apply $topic in your own projects."), 0.15)
+)
+
+_CATEGORY_POINTS = {
+    "vg": _POINTS_VIDEOGEN,
+    "ai": _POINTS_AI
+}
+
+# (hook, introduction, conclusion) templates per topic category; None is the generic outline
+_OUTLINE_TEMPLATES = {
+    "vg": (
+        Template("Discover the Future: $headline"),
+        Template("In this video, we explore $topic. Learn how AI agents revolutionize content creation and automation."),
+        Template("This system demonstrates how AI agents can collaborate to create professional, topic-specific content automatically. $headline represents the future of content creation.")
+    ),
+    "ai": (
+        Template("AI Revolution: $topic"),
+        Template("Explore $topic and understand how artificial intelligence transforms industries."),
+        Template("$topic is reshaping our world. Understanding these technologies positions you for future success.")
+    ),
+    None: (
+        Template("Essential Guide to $topic"),
+        Template("This comprehensive video covers $topic in detail."),
+        Template("$topic is an important skill for the modern world. Start learning today!")
+    )
+}
+
+@lru_cache(maxsize=512)
+def _build_topic_outline(topic: str, duration: int) -> Mapping[str, Any]:
+    """Build a read-only, cached outline for the given topic and duration"""
+    
+    # Classify the topic in one scan; video-generator matches take precedence
+    category = None
+    for match in _CATEGORY_RE.finditer(topic):
+        category = match.lastgroup
+        if category == "vg":
+            break
+    
+    # Generate contextual hook, introduction and conclusion
+    fields = {"topic": topic, "headline": topic.split('-')[0].strip()}
+    hook, intro, conclusion = (template.substitute(fields) for template in _OUTLINE_TEMPLATES[category])
+    
+    if category in _CATEGORY_POINTS:
+        templates = _CATEGORY_POINTS[category]
+    else:
+        # Generic outline for other topics
+        templates = tuple(
+            (point.substitute(fields), details.substitute(fields), ratio)
+            for point, details, ratio in _POINTS_GENERIC
+        )
+    
+    points = tuple(
+        MappingProxyType({"point": point, "duration": duration * ratio, "details": details})
+        for point, details, ratio in templates
+    )
+    
+    return MappingProxyType({
+        "hook": hook,
+        "introduction": intro,
+        "main_points": points,
+        "conclusion": conclusion,
+        "topic": topic
+    })
 
 class ScriptWriterAgent(BaseAgent):
     """Sequential agent for writing video scripts"""
@@ -28,12 +156,12 @@ class ScriptWriterAgent(BaseAgent):
             "outline": outline,
             "scenes": scenes,
             "final_script": final_script,
-            "estimated_duration": self._calculate_duration(scenes)
+            "estimated_duration": final_script["total_duration"]
         }
     
     async def _create_outline(self, research: Dict, topic: str, duration: int) -> Dict[str, Any]:
         """Create detailed outline based on topic"""
-        await asyncio.sleep(0.5)
+        await self._simulate_latency(0.5)
         
         # Generate topic-specific content
         outline_content = self._generate_topic_specific_outline(topic, duration)
@@ -42,191 +170,104 @@ class ScriptWriterAgent(BaseAgent):
     
     def _generate_topic_specific_outline(self, topic: str, duration: int) -> Dict[str, Any]:
         """Generate specific content for the given topic"""
+        cached = _build_topic_outline(topic, duration)
         
-        # Extract key concepts from topic
-        topic_lower = topic.lower()
-        
-        # Generate contextual hook and introduction
-        if "video generator" in topic_lower or "ai agent" in topic_lower:
-            hook = f"Discover the Future: {topic.split('-')[0].strip()}"
-            intro = f"In this video, we explore {topic}. Learn how AI agents revolutionize content creation and automation."
-            points = [
-                {
-                    "point": "Understanding Multi-Agent Architecture",
-                    "duration": duration * 0.3,
-                    "details": "Multi-agent systems combine multiple specialized AI agents working together. Each agent has specific responsibilities: research, writing, production, and quality control. This distributed approach ensures comprehensive content generation with diverse perspectives and expertise."
-                },
-                {
-                    "point": "Script Writing and Content Generation",
-                    "duration": duration * 0.35,
-                    "details": "The script writer agent analyzes research data to create compelling narratives. It structures content logically, creates engaging hooks, develops key points with supporting details, and crafts memorable conclusions. The agent ensures pacing matches video duration and maintains audience engagement throughout."
-                },
-                {
-                    "point": "Video Production and Assembly",
-                    "duration": duration * 0.25,
-                    "details": "Once the script is ready, production agents handle visual creation. They generate animated slides, add text overlays, create transitions, and assemble final videos. Quality validation ensures all components meet professional standards before delivery."
-                },
-                {
-                    "point": "Benefits and Real-World Applications",
-                    "duration": duration * 0.1,
-                    "details": "Automated video generation saves time and resources. It enables rapid content creation for education, marketing, and entertainment. Multi-agent systems adapt to different topics and styles automatically."
-                }
-            ]
-            conclusion = f"This system demonstrates how AI agents can collaborate to create professional, topic-specific content automatically. {topic.split('-')[0].strip()} represents the future of content creation."
-            
-        elif "ai" in topic_lower or "agent" in topic_lower or "automation" in topic_lower:
-            hook = f"AI Revolution: {topic}"
-            intro = f"Explore {topic} and understand how artificial intelligence transforms industries."
-            points = [
-                {
-                    "point": "What is AI and How Does It Work?",
-                    "duration": duration * 0.25,
-                    "details": "AI systems learn from data and make intelligent decisions. They process information, identify patterns, and generate insights. Modern AI uses machine learning and neural networks to continuously improve."
-                },
-                {
-                    "point": "Key Applications in Business",
-                    "duration": duration * 0.35,
-                    "details": "AI powers automation, analytics, customer service, and content creation. Companies use AI to reduce costs, improve quality, and accelerate innovation. Real-world examples show measurable ROI."
-                },
-                {
-                    "point": "Challenges and Future Outlook",
-                    "duration": duration * 0.25,
-                    "details": "AI faces challenges around bias, interpretability, and ethics. Future developments will address these concerns. The AI industry continues to evolve with breakthrough innovations."
-                },
-                {
-                    "point": "How You Can Get Started",
-                    "duration": duration * 0.15,
-                    "details": "Learn AI fundamentals through online courses. Start with Python and machine learning libraries. Build projects that solve real problems. Join the AI community and stay updated."
-                }
-            ]
-            conclusion = f"{topic} is reshaping our world. Understanding these technologies positions you for future success."
-            
-        else:
-            # Generic outline for other topics
-            hook = f"Essential Guide to {topic}"
-            intro = f"This comprehensive video covers {topic} in detail."
-            points = [
-                {
-                    "point": f"Introduction to {topic}",
-                    "duration": duration * 0.25,
-                    "details": f"Understand the fundamentals of {topic}. Learn key concepts and terminology."
-                },
-                {
-                    "point": f"Core Principles of {topic}",
-                    "duration": duration * 0.35,
-                    "details": f"Explore the main principles and best practices for {topic}."
-                },
-                {
-                    "point": f"Practical Applications",
-                    "duration": duration * 0.25,
-                    "details": f"See real-world examples of {topic} in action."
-                },
-                {
-                    "point": f"Next Steps and Resources",
-                    "duration": duration * 0.15,
-                    "details": f"Learn how to apply {topic} in your own projects."
-                }
-            ]
-            conclusion = f"{topic} is an important skill for the modern world. Start learning today!"
-        
-        return {
-            "hook": hook,
-            "introduction": intro,
-            "main_points": points,
-            "conclusion": conclusion,
-            "topic": topic
-        }
+        # Hand out a mutable copy so callers never touch the cached outline
+        outline = dict(cached)
+        outline["main_points"] = [dict(point) for point in cached["main_points"]]
+        return outline
     
     async def _develop_scenes(self, outline: Dict, research: Dict) -> List[Dict]:
         """Develop detailed scenes from outline"""
-        await asyncio.sleep(0.5)
+        await self._simulate_latency(0.5)
         
-        scenes = []
+        main_points = outline.get("main_points", ())
+        hook = outline.get("hook", "")
+        conclusion = outline.get("conclusion", "")
         
         # Title scene
-        scenes.append({
+        scenes = [{
             "scene_number": 0,
             "type": "title",
             "title": outline.get("topic", "Video"),
-            "subtitle": outline.get("hook", ""),
+            "subtitle": hook,
             "duration_seconds": 5,
-            "content": f"🎬 {outline.get('hook', '')}",
+            "content": f"🎬 {hook}",
             "voiceover_text": outline.get("introduction", "")
-        })
+        }]
         
         # Main point scenes
-        for i, point in enumerate(outline.get("main_points", [])):
+        for i, point in enumerate(main_points, 1):
+            title = point.get("point", "")
+            details = point.get("details")
             scenes.append({
-                "scene_number": i + 1,
+                "scene_number": i,
                 "type": "content",
-                "title": point.get("point", ""),
-                "content": point.get("details", point.get("point", "")),
+                "title": title,
+                "content": title if details is None else details,
                 "duration_seconds": int(point.get("duration", 10)),
-                "voiceover_text": point.get("details", ""),
-                "key_points": self._extract_key_points(point.get("details", ""))
+                "voiceover_text": details or "",
+                "key_points": self._extract_key_points(details or "")
             })
         
         # Conclusion scene
         scenes.append({
-            "scene_number": len(outline.get("main_points", [])) + 1,
+            "scene_number": len(main_points) + 1,
             "type": "conclusion",
             "title": "Key Takeaways",
-            "content": outline.get("conclusion", ""),
+            "content": conclusion,
             "duration_seconds": 5,
-            "voiceover_text": outline.get("conclusion", "")
+            "voiceover_text": conclusion
         })
         
         return scenes
     
     def _extract_key_points(self, text: str) -> List[str]:
         """Extract key points from detailed text"""
-        # Split text into sentences and take important ones
-        sentences = text.split(". ")
-        key_points = []
-        
-        for sentence in sentences[:3]:  # Take first 3 sentences as key points
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 10:
-                # Shorten if too long
-                if len(sentence) > 100:
-                    sentence = sentence[:100] + "..."
-                key_points.append(sentence)
+        # Take the first 3 sentences as key points, shortening long ones
+        sentences = (sentence.strip() for sentence in _SENTENCE_RE.split(text, maxsplit=3)[:3])
+        key_points = [
+            sentence[:100] + "..." if len(sentence) > 100 else sentence
+            for sentence in sentences if len(sentence) > 10
+        ]
         
         return key_points if key_points else [text[:100]]
     
     async def _polish_script(self, scenes: List[Dict]) -> Dict[str, Any]:
         """Polish script and format for video generation"""
-        await asyncio.sleep(0.5)
+        await self._simulate_latency(0.5)
         
-        # Organize scenes into sections
+        # Organize scenes into sections, picking out title/conclusion and total duration in one pass
         sections = []
+        title_scene = None
+        conclusion_scene = None
+        total_duration = 0
         for scene in scenes:
-            if scene.get("type") != "title":
-                sections.append({
-                    "heading": scene.get("title", ""),
-                    "key_points": scene.get("key_points", [scene.get("content", "")]),
-                    "duration_seconds": scene.get("duration_seconds", 10),
-                    "voiceover": scene.get("voiceover_text", "")
-                })
-        
-        # Get first scene (title)
-        title_scene = next((s for s in scenes if s.get("type") == "title"), None)
-        tagline = title_scene.get("subtitle", "") if title_scene else ""
+            total_duration += scene["duration_seconds"]
+            scene_type = scene.get("type")
+            if scene_type == "title":
+                if title_scene is None:
+                    title_scene = scene
+                continue
+            if scene_type == "conclusion" and conclusion_scene is None:
+                conclusion_scene = scene
+            sections.append({
+                "heading": scene.get("title", ""),
+                "key_points": scene.get("key_points", [scene.get("content", "")]),
+                "duration_seconds": scene.get("duration_seconds", 10),
+                "voiceover": scene.get("voiceover_text", "")
+            })
         
-        # Get conclusion
-        conclusion_scene = next((s for s in scenes if s.get("type") == "conclusion"), None)
+        tagline = title_scene.get("subtitle", "") if title_scene else ""
         conclusion = [conclusion_scene.get("content", "")] if conclusion_scene else []
         
         return {
             "title": title_scene.get("title", "Video") if title_scene else "Video",
             "tagline": tagline,
-            "total_duration": sum(scene["duration_seconds"] for scene in scenes),
+            "total_duration": total_duration,
             "sections": sections,
             "conclusion": conclusion,
             "target_audience": "General audience",
             "style": "Educational and engaging",
-            "created_at": __import__('datetime').datetime.now().isoformat()
+            "created_at": datetime.now().isoformat()
         }
-    
-    def _calculate_duration(self, scenes: List[Dict]) -> int:
-        return sum(scene["duration_seconds"] for scene in scenes)
\ No newline at end of file
@@ -1,13 +1,37 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 import asyncio
 import logging
 import os
+import wave
 from .sequential_agents import ScriptWriterAgent
 from .parallel_agents import ResearchAgent, ParallelAgentExecutor
 from .loop_agents import QualityValidatorAgent
 from memory.session_manager import SessionManager
+from memory.tts_cache import TTSCache
 from tools.custom_tools import VoiceSynthesisTool, VideoEditorTool, ThumbnailGeneratorTool, AnimatedSlideGenerator
 
+# Transitions cycled across content slides
+_TRANSITIONS = ("fade", "slide", "wipe")
+
+# ffmpeg raw sample formats for PCM WAV sample widths (bytes)
+_PCM_SAMPLE_FORMATS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+# Streaming narration to ffmpeg over an inherited pipe (pass_fds, "pipe:<fd>") needs POSIX
+_STREAM_PCM = os.name == "posix"
+
+
+def _read_pcm(path: str) -> Tuple[Optional[Tuple[str, int, int]], bytes]:
+    """Raw samples of a PCM WAV file with their (sample format, rate, channels), or (None, b"")"""
+    try:
+        with wave.open(path, "rb") as wav:
+            sample_fmt = _PCM_SAMPLE_FORMATS.get(wav.getsampwidth())
+            if sample_fmt is None:
+                return None, b""
+            return (sample_fmt, wav.getframerate(), wav.getnchannels()), wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError, OSError):
+        return None, b""
+
+
 class VideoProductionTeam:
     """Orchestrate the entire video production workflow"""
     
@@ -24,6 +48,7 @@ class VideoProductionTeam:
         self.video_tool = VideoEditorTool()
         self.thumbnail_tool = ThumbnailGeneratorTool()
         self.animated_slides = AnimatedSlideGenerator()  # New animated slide generator
+        self.tts_cache = TTSCache()
         
         # Research agents
         self.research_agents = [
@@ -32,25 +57,37 @@ class VideoProductionTeam:
             ResearchAgent("competition")
         ]
     
-    async def execute_workflow(self, session) -> Dict[str, Any]:
+    async def execute_workflow(self, session, session_manager: Optional[SessionManager] = None) -> Dict[str, Any]:
         """Execute complete video production workflow"""
-        self.logger.info(f"Starting production workflow for session: {session.session_id}")
+        self.logger.info("Starting production workflow for session: %s", session.session_id)
+        
+        def _record_phase(phase: str, progress: float):
+            # Buffered in memory and applied once when the workflow ends
+            if session_manager is not None:
+                session_manager.record_phase(session.session_id, phase, {"progress": progress})
+            else:
+                self.logger.debug("No session manager; phase %s (%.0f%%) not recorded", phase, progress * 100)
         
         try:
             # Phase 1: Research (Parallel)
             research_results = await self._execute_research_phase(session.topic)
+            _record_phase("research", 0.2)
             
             # Phase 2: Script Writing (Sequential) 
             script_result = await self._execute_script_phase(session.topic, research_results)
+            _record_phase("script", 0.4)
             
             # Phase 3: Production (Parallel)
             production_results = await self._execute_production_phase(script_result)
+            _record_phase("production", 0.6)
             
             # Phase 4: Quality Validation (Loop)
             final_assets = await self._execute_quality_phase(production_results)
+            _record_phase("quality", 0.8)
             
             # Phase 5: Final Assembly
             final_video = await self._assemble_final_video(final_assets)
+            _record_phase("assembly", 1.0)
             
             return {
                 "success": True,
@@ -64,8 +101,11 @@ class VideoProductionTeam:
             }
             
         except Exception as e:
-            self.logger.error(f"Production workflow failed: {str(e)}")
+            self.logger.error("Production workflow failed: %s", e)
             raise
+        finally:
+            if session_manager is not None:
+                session_manager.flush_phases(session.session_id)
     
     async def _execute_research_phase(self, topic: str) -> Dict[str, Any]:
         """Execute parallel research phase"""
@@ -106,30 +146,33 @@ class VideoProductionTeam:
         scenes = script_data.get("final_script", {}).get("scenes", [])
         
         # Generate voiceover for each scene
-        voiceover_tasks = []
-        for scene in scenes:
-            voiceover_text = scene.get("voiceover_text", "")
-            if voiceover_text:
-                voiceover_tasks.append(
-                    self.voice_tool.synthesize_speech(voiceover_text)
-                )
-        
-        # Generate thumbnail
-        thumbnail_task = self.thumbnail_tool.generate_thumbnail(
-            script_data.get("final_script", {}).get("title", "Video Title")
-        )
+        voiceover_texts = [
+            scene.get("voiceover_text", "") for scene in scenes
+            if scene.get("voiceover_text", "")
+        ]
         
-        # Execute production tasks in parallel
-        production_results = await asyncio.gather(
-            *voiceover_tasks,
-            thumbnail_task,
+        # Synthesize all voiceovers in one batch while the thumbnail is generated
+        voiceovers, thumbnail = await asyncio.gather(
+            self.voice_tool.synthesize_batch(voiceover_texts),
+            self.thumbnail_tool.generate_thumbnail(
+                script_data.get("final_script", {}).get("title", "Video Title")
+            ),
             return_exceptions=True
         )
         
+        # Each group has its own failure policy: voiceover errors stay per
+        # segment, while a missing thumbnail is non-fatal
+        if isinstance(voiceovers, Exception):
+            voiceovers = [voiceovers] * len(voiceover_texts)
+        
+        if isinstance(thumbnail, Exception):
+            self.logger.warning("Thumbnail generation failed: %s", thumbnail)
+            thumbnail = None
+        
         # Process results
         assets = {
-            "voiceovers": production_results[:-1],  # All except thumbnail
-            "thumbnail": production_results[-1],    # Last item is thumbnail
+            "voiceovers": voiceovers,
+            "thumbnail": thumbnail,
             "script": script_data,
             "scenes": scenes
         }
@@ -171,14 +214,6 @@ class VideoProductionTeam:
         # Convert script sections into animated slides
         slides = self._convert_script_to_slides(script)
         
-        # Create animated video with Gamma-like effects
-        video_path = "output_videos/output_video.mp4"
-        video_path = self.animated_slides.create_animated_video(
-            slides,
-            output_path=video_path,
-            fps=30
-        )
-        
         # Generate voiceover narration for all slides
         voiceover_texts = []
         for slide in slides:
@@ -188,103 +223,218 @@ class VideoProductionTeam:
                 narration += " " + " ".join(content)
             voiceover_texts.append(narration)
         
-        self.logger.info(f"🔊 Generating voiceover for {len(voiceover_texts)} slides")
-        audio_files = await self.voice_tool.synthesize_multiple(voiceover_texts)
+        self.logger.info("🔊 Generating voiceover for %d slides", len(voiceover_texts))
         
-        if audio_files and len(audio_files) > 0:
-            self.logger.info(f"✓ Generated {len(audio_files)} audio segments")
-            try:
-                # Try to merge audio with video using FFmpeg if available
-                final_video = await self._merge_audio_video(video_path, audio_files)
-                self.logger.info(f"✓ Final video with audio assembled: {final_video}")
+        voiceover_texts = [text for text in voiceover_texts if text.strip()]
+        if voiceover_texts:
+            # Render the slides straight into FFmpeg alongside the narration if available
+            final_video = await self._render_video_with_audio(slides, self._narrate(voiceover_texts), fps=30)
+            if final_video:
+                self.logger.info("✓ Final video with audio assembled: %s", final_video)
                 return final_video
-            except Exception as e:
-                self.logger.warning(f"Could not merge audio: {e}. Returning video without narration.")
-                return video_path
-        else:
-            self.logger.warning("No audio files generated. Returning video without narration.")
-            return video_path
+        
+        self.logger.warning("Returning video without narration.")
+        
+        # Create animated video with Gamma-like effects
+        return self.animated_slides.create_animated_video(
+            slides,
+            output_path="output_videos/output_video.mp4",
+            fps=30
+        )
     
-    async def _merge_audio_video(self, video_path: str, audio_files: List[str]) -> str:
-        """Merge audio narration with video (requires ffmpeg)"""
+    async def _narrate(self, texts: List[str]) -> AsyncIterator[str]:
+        """Yield narration audio files in slide order as soon as each one is ready"""
+        voice = self.voice_tool.cache_voice_key()
+        
+        # Reuse cached narration; every cache miss starts synthesizing up front,
+        # and awaiting them in order lets early slides through before later ones finish
+        pending = [asyncio.ensure_future(self.tts_cache.get_or_synth(text, voice, self.voice_tool.enqueue))
+                   for text in texts]
+        try:
+            for item in pending:
+                audio_file = await item
+                if audio_file:
+                    yield audio_file
+        finally:
+            for item in pending:
+                if not item.done():
+                    item.cancel()
+    
+    async def _render_video_with_audio(self, slides: List[Dict[str, Any]], narration: AsyncIterator[str],
+                                       fps: int = 30) -> Optional[str]:
+        """
+        Pipe rendered slide frames into ffmpeg and mux the narration in one pass (requires ffmpeg)
+        
+        On POSIX, PCM WAV narration is streamed to ffmpeg in slide order while
+        later segments are still being synthesized; other audio formats, and all
+        narration on other platforms, are passed as files once every segment is ready.
+        """
         try:
-            import subprocess
+            first = await anext(narration, None)
+            if first is None:
+                self.logger.warning("No audio files generated.")
+                return None
             
-            # Create a concat file for audio files
-            audio_concat = "output_videos/audio_concat.txt"
-            with open(audio_concat, 'w') as f:
+            loop = asyncio.get_running_loop()
+            pcm_format, pcm = None, b""
+            if _STREAM_PCM:
+                pcm_format, pcm = await loop.run_in_executor(None, _read_pcm, first)
+            
+            if pcm_format is None:
+                audio_files = [first] + [audio_file async for audio_file in narration]
+                self.logger.info("✓ Generated %d audio segments", len(audio_files))
+                
+                # Narration files are concatenated by a filter
+                audio_args = []
                 for audio_file in audio_files:
-                    f.write(f"file '{os.path.abspath(audio_file)}'\n")
+                    audio_args += ["-i", audio_file]
+                audio_inputs = "".join(f"[{idx}:a]" for idx in range(1, len(audio_files) + 1))
+                audio_args += [
+                    "-filter_complex", f"{audio_inputs}concat=n={len(audio_files)}:v=0:a=1[a]",
+                    "-map", "0:v", "-map", "[a]"
+                ]
+                return await self._run_ffmpeg_render(slides, fps, audio_args)
             
-            # Concatenate all audio files
-            combined_audio = "output_videos/combined_audio.wav"
-            concat_cmd = [
-                "ffmpeg", "-f", "concat", "-safe", "0", "-i", audio_concat,
-                "-c", "aac", "-q:a", "9", combined_audio, "-y"
+            # Raw samples of every segment go down one pipe back to back
+            sample_fmt, rate, channels = pcm_format
+            read_fd, write_fd = os.pipe()
+            audio_pipe = os.fdopen(write_fd, "wb")
+            audio_args = [
+                "-f", sample_fmt, "-ar", str(rate), "-ac", str(channels), "-i", f"pipe:{read_fd}",
+                "-map", "0:v", "-map", "1:a"
             ]
             
-            # Run ffmpeg (silently)
-            result = subprocess.run(concat_cmd, capture_output=True, timeout=300)
+            async def _stream_audio():
+                segments = 0
+                segment_format, segment = pcm_format, pcm
+                try:
+                    while True:
+                        if segment_format == pcm_format:
+                            await loop.run_in_executor(None, audio_pipe.write, segment)
+                            segments += 1
+                        else:
+                            self.logger.warning("Skipping narration segment with a different audio format")
+                        
+                        audio_file = await anext(narration, None)
+                        if audio_file is None:
+                            break
+                        segment_format, segment = await loop.run_in_executor(None, _read_pcm, audio_file)
+                finally:
+                    await loop.run_in_executor(None, audio_pipe.close)
+                self.logger.info("✓ Streamed %d audio segments", segments)
             
-            if result.returncode == 0:
-                self.logger.info("✓ Audio files concatenated successfully")
-                
-                # Merge audio with video
-                output_with_audio = "output_videos/output_video_with_audio.mp4"
-                merge_cmd = [
-                    "ffmpeg", "-i", video_path, "-i", combined_audio,
-                    "-c:v", "copy", "-c:a", "aac", "-shortest",
-                    output_with_audio, "-y"
-                ]
-                
-                result = subprocess.run(merge_cmd, capture_output=True, timeout=600)
-                
-                if result.returncode == 0:
-                    self.logger.info("✓ Audio merged with video successfully")
-                    return output_with_audio
-                else:
-                    self.logger.warning(f"FFmpeg merge failed: {result.stderr.decode()}")
-                    return video_path
-            else:
-                self.logger.warning(f"FFmpeg concat failed: {result.stderr.decode()}")
-                return video_path
-                
+            try:
+                return await self._run_ffmpeg_render(
+                    slides, fps, audio_args, pass_fds=(read_fd,), stream_audio=_stream_audio
+                )
+            finally:
+                if not audio_pipe.closed:
+                    audio_pipe.close()
+        finally:
+            await narration.aclose()
+    
+    async def _run_ffmpeg_render(self, slides: List[Dict[str, Any]], fps: int, audio_args: List[str],
+                                 pass_fds: Tuple[int, ...] = (),
+                                 stream_audio: Optional[Callable[[], Awaitable[None]]] = None) -> Optional[str]:
+        """Run ffmpeg on slide frames from stdin plus the given audio inputs; closes pass_fds here once spawned"""
+        width, height = self.animated_slides.frame_size
+        output_with_audio = "output_videos/output_video_with_audio.mp4"
+        
+        # Raw BGR frames arrive on stdin
+        cmd = [
+            "ffmpeg", "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{width}x{height}", "-r", str(fps), "-i", "pipe:0",
+            *audio_args,
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest",
+            output_with_audio, "-y"
+        ]
+        
+        try:
+            # A 1 MiB stream limit keeps ffmpeg's bursty stderr to a few large reads
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                limit=1 << 20,
+                pass_fds=pass_fds
+            )
         except FileNotFoundError:
             self.logger.warning("FFmpeg not found. Install ffmpeg to enable audio merging.")
-            return video_path
+            return None
+        except Exception as e:
+            self.logger.warning("Could not start FFmpeg: %s", e)
+            return None
+        finally:
+            # ffmpeg has its own copies; ours must go so writers see a broken pipe if it exits
+            for fd in pass_fds:
+                os.close(fd)
+        
+        async def _write_frames():
+            for frame in self.animated_slides.iter_frames(slides, fps):
+                proc.stdin.write(frame.tobytes())
+                await proc.stdin.drain()
+            proc.stdin.close()
+            await proc.stdin.wait_closed()
+        
+        # Drain stderr concurrently so a full pipe can't stall ffmpeg while we write
+        stderr_task = asyncio.create_task(proc.stderr.read())
+        writers = [_write_frames()]
+        if stream_audio is not None:
+            writers.append(stream_audio())
+        
+        results = await asyncio.gather(*writers, return_exceptions=True)
+        # A broken pipe means ffmpeg exited early; its stderr explains why
+        errors = [
+            result for result in results
+            if isinstance(result, Exception) and not isinstance(result, (BrokenPipeError, ConnectionResetError))
+        ]
+        try:
+            if errors:
+                raise errors[0]
+            await asyncio.wait_for(proc.wait(), timeout=600)
         except Exception as e:
-            self.logger.warning(f"Audio-video merge failed: {e}")
-            return video_path
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            stderr_task.cancel()
+            self.logger.warning("Audio-video render failed: %s", e)
+            return None
+        
+        stderr = await stderr_task
+        if proc.returncode == 0:
+            self.logger.info("✓ Audio merged with video successfully")
+            return output_with_audio
+        
+        self.logger.warning("FFmpeg merge failed: %s", stderr.decode(errors="replace"))
+        return None
     
     def _convert_script_to_slides(self, script: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Convert script into animated slide objects"""
-        slides = []
+        conclusion = script.get("conclusion")
+        sections = script.get("sections", ())
         
-        # Title slide
-        slides.append({
+        # Title slide, content slides from sections (varying transitions), conclusion slide
+        slides = [{
             "title": script.get("title", "Video"),
             "content": [script.get("tagline", "")],
             "duration": 5,
             "transition": "fade",
             "slide_number": 1
-        })
-        
-        # Content slides from sections
-        sections = script.get("sections", [])
-        for idx, section in enumerate(sections):
-            slide = {
+        }]
+        slides += [
+            {
                 "title": section.get("heading", ""),
                 "content": section.get("key_points", []),
                 "duration": section.get("duration_seconds", 5),
-                "transition": ["fade", "slide", "wipe"][idx % 3],  # Vary transitions
+                "transition": _TRANSITIONS[idx % 3],
                 "slide_number": idx + 2
             }
-            slides.append(slide)
-        
-        # Conclusion slide
+            for idx, section in enumerate(sections)
+        ]
         slides.append({
             "title": "Key Takeaways",
-            "content": script.get("conclusion", []) if isinstance(script.get("conclusion"), list) else [script.get("conclusion", "")],
+            "content": conclusion if isinstance(conclusion, list) else [conclusion or ""],
             "duration": 5,
             "transition": "fade",
             "slide_number": len(slides) + 1
@@ -295,4 +445,4 @@ class VideoProductionTeam:
         for slide in slides:
             slide["total_slides"] = total
         
-        return slides
\ No newline at end of file
+        return slides
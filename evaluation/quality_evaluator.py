@@ -1,7 +1,68 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Awaitable, Callable, List
+import re
+import asyncio
+import json
+import hashlib
+import itertools
 import logging
+import numpy as np
+from collections import OrderedDict
+from types import MappingProxyType
 from datetime import datetime
 
+# Asset flags read by _evaluate_production
+_PRODUCTION_ASSETS = ("voiceovers", "thumbnail", "visuals", "video_assembled")
+
+# Keywords that lift engagement and SEO scores when they appear in the title
+_ENGAGEMENT_TITLE_RE = re.compile(r"how|why|secret|amazing")
+_SEO_KEYWORD_RE = re.compile(r"ai|technology|future")
+
+# Improvement suggestions for each metric scoring below 0.7, in priority order
+_RECOMMENDATIONS = (
+    ("content_quality", (
+        "Add more detailed explanations in the script",
+        "Include real-world examples and case studies",
+        "Strengthen the introduction and conclusion"
+    )),
+    ("production_value", (
+        "Improve audio quality and add background music",
+        "Enhance visual elements with better graphics",
+        "Ensure smooth transitions between scenes"
+    )),
+    ("engagement_potential", (
+        "Add more engaging hooks and storytelling elements",
+        "Include calls to action to encourage viewer interaction",
+        "Optimize video length for audience retention"
+    )),
+    ("seo_effectiveness", (
+        "Optimize title with relevant keywords",
+        "Expand video description with more details",
+        "Add more specific tags for better discoverability"
+    ))
+)
+
+# Reference scores for compare_with_benchmark (read-only, shared across calls)
+_BENCHMARKS = MappingProxyType({
+    "youtube_educational": MappingProxyType({
+        "content_quality": 0.75,
+        "production_value": 0.70,
+        "engagement_potential": 0.80,
+        "seo_effectiveness": 0.65,
+        "overall_score": 0.73
+    }),
+    "youtube_viral": MappingProxyType({
+        "content_quality": 0.70,
+        "production_value": 0.75,
+        "engagement_potential": 0.85,
+        "seo_effectiveness": 0.70,
+        "overall_score": 0.75
+    })
+})
+
+# Weighted contribution of each sub-score to the overall score
+_WEIGHT_KEYS = ("content_quality", "production_value", "engagement_potential", "seo_effectiveness")
+_WEIGHTS = np.array([0.4, 0.3, 0.2, 0.1])
+
 class VideoQualityEvaluator:
     """Evaluate the quality of generated videos"""
     
@@ -14,25 +75,58 @@ class VideoQualityEvaluator:
             "seo_effectiveness",
             "overall_score"
         ]
+        # Sub-scores keyed by (evaluator, digest of the inputs it reads), LRU-bounded
+        self._score_cache: "OrderedDict[tuple, float]" = OrderedDict()
+        self._score_cache_size = 256
+        # Disambiguates evaluation ids created within the same second
+        self._eval_counter = itertools.count()
     
     async def evaluate_video(self, video_data: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive video quality evaluation"""
         self.logger.info("Starting video quality evaluation")
         
+        now = datetime.now()
         evaluation = {
-            "evaluation_id": f"eval_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "timestamp": datetime.now().isoformat(),
+            "evaluation_id": f"eval_{now.strftime('%Y%m%d_%H%M%S')}_{next(self._eval_counter)}",
+            "timestamp": now.isoformat(),
             "scores": {},
             "feedback": {},
             "recommendations": []
         }
         
         try:
-            # Evaluate different aspects
-            evaluation["scores"]["content_quality"] = await self._evaluate_content(video_data)
-            evaluation["scores"]["production_value"] = await self._evaluate_production(video_data)
-            evaluation["scores"]["engagement_potential"] = await self._evaluate_engagement(video_data)
-            evaluation["scores"]["seo_effectiveness"] = await self._evaluate_seo(video_data)
+            script = video_data.get("script", {})
+            metadata = video_data.get("metadata", {})
+            assets = video_data.get("assets", {})
+            scenes = script.get("scenes", [])
+            
+            # Evaluate the independent aspects concurrently, reusing sub-scores
+            # whose inputs are unchanged
+            scores = evaluation["scores"]
+            (
+                scores["content_quality"],
+                scores["production_value"],
+                scores["engagement_potential"],
+                scores["seo_effectiveness"]
+            ) = await asyncio.gather(
+                self._cached_score(
+                    "content", self._evaluate_content, video_data,
+                    [bool(script.get("title")), [scene.get("content", "") for scene in scenes]]
+                ),
+                self._cached_score(
+                    "production", self._evaluate_production, video_data,
+                    [bool(assets.get(name)) for name in _PRODUCTION_ASSETS]
+                ),
+                self._cached_score(
+                    "engagement", self._evaluate_engagement, video_data,
+                    [script.get("title", ""), metadata.get("duration", 0),
+                     [scene.get("duration_seconds", 0) for scene in scenes]]
+                ),
+                self._cached_score(
+                    "seo", self._evaluate_seo, video_data,
+                    [script.get("title", ""), metadata.get("description", ""), len(metadata.get("tags", []))]
+                )
+            )
             
             # Calculate overall score
             evaluation["scores"]["overall_score"] = self._calculate_overall_score(evaluation["scores"])
@@ -44,16 +138,34 @@ class VideoQualityEvaluator:
             # Determine if video meets quality standards
             evaluation["meets_standards"] = evaluation["scores"]["overall_score"] >= 0.7
             
-            self.logger.info(f"Evaluation completed. Overall score: {evaluation['scores']['overall_score']:.2f}")
+            self.logger.info("Evaluation completed. Overall score: %.2f", evaluation["scores"]["overall_score"])
             
         except Exception as e:
-            self.logger.error(f"Evaluation failed: {str(e)}")
+            self.logger.error("Evaluation failed: %s", e)
             evaluation["error"] = str(e)
             evaluation["scores"]["overall_score"] = 0.0
             evaluation["meets_standards"] = False
         
         return evaluation
     
+    async def _cached_score(self, name: str, evaluate: Callable[[Dict[str, Any]], Awaitable[float]],
+                            video_data: Dict[str, Any], inputs: Any) -> float:
+        """Run a sub-evaluator unless a score for identical inputs is already cached"""
+        digest = hashlib.blake2b(
+            json.dumps(inputs, sort_keys=True, default=str).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        key = (name, digest)
+        
+        if key in self._score_cache:
+            self._score_cache.move_to_end(key)
+            return self._score_cache[key]
+        
+        score = await evaluate(video_data)
+        self._score_cache[key] = score
+        if len(self._score_cache) > self._score_cache_size:
+            self._score_cache.popitem(last=False)
+        return score
+    
     async def _evaluate_content(self, video_data: Dict[str, Any]) -> float:
         """Evaluate content quality"""
         script = video_data.get("script", {})
@@ -68,16 +180,20 @@ class VideoQualityEvaluator:
         if len(scenes) >= 3:  # Minimum scenes for good structure
             score += 0.3
         
+        contents = [scene.get("content", "") for scene in scenes]
+        
         # Score based on content depth
-        total_content = sum(len(scene.get("content", "")) for scene in scenes)
-        if total_content > 1000:
+        lengths = np.fromiter(map(len, contents), dtype=np.int64, count=len(contents))
+        if lengths.sum() > 1000:
             score += 0.3
         
-        # Score based on engagement elements
-        if any("hook" in scene.get("content", "").lower() for scene in scenes):
+        # Score based on engagement elements (one lowercase scan; the separator
+        # keeps matches from spanning two scenes)
+        combined = " | ".join(contents).lower()
+        if "hook" in combined:
             score += 0.2
         
-        if any("call to action" in scene.get("content", "").lower() for scene in scenes):
+        if "call to action" in combined:
             score += 0.1
         
         return min(score, 1.0)
@@ -113,7 +229,7 @@ class VideoQualityEvaluator:
         
         # Score based on title engagement
         title = script.get("title", "")
-        if any(word in title.lower() for word in ["how", "why", "secret", "amazing"]):
+        if _ENGAGEMENT_TITLE_RE.search(title.lower()):
             score += 0.2
         
         # Score based on duration appropriateness
@@ -155,22 +271,15 @@ class VideoQualityEvaluator:
             score += 0.2
         
         # Keyword optimization (simplified)
-        if any(keyword in title.lower() for keyword in ["ai", "technology", "future"]):
+        if _SEO_KEYWORD_RE.search(title.lower()):
             score += 0.2
         
         return min(score, 1.0)
     
     def _calculate_overall_score(self, scores: Dict[str, float]) -> float:
         """Calculate weighted overall score"""
-        weights = {
-            "content_quality": 0.4,
-            "production_value": 0.3,
-            "engagement_potential": 0.2,
-            "seo_effectiveness": 0.1
-        }
-        
-        overall = sum(scores[metric] * weights[metric] for metric in weights)
-        return round(overall, 2)
+        overall = np.dot(_WEIGHTS, [scores[metric] for metric in _WEIGHT_KEYS])
+        return round(float(overall), 2)
     
     async def _generate_feedback(self, scores: Dict[str, float]) -> Dict[str, str]:
         """Generate constructive feedback"""
@@ -192,56 +301,17 @@ class VideoQualityEvaluator:
         """Generate improvement recommendations"""
         recommendations = []
         
-        if scores["content_quality"] < 0.7:
-            recommendations.extend([
-                "Add more detailed explanations in the script",
-                "Include real-world examples and case studies",
-                "Strengthen the introduction and conclusion"
-            ])
-        
-        if scores["production_value"] < 0.7:
-            recommendations.extend([
-                "Improve audio quality and add background music",
-                "Enhance visual elements with better graphics",
-                "Ensure smooth transitions between scenes"
-            ])
-        
-        if scores["engagement_potential"] < 0.7:
-            recommendations.extend([
-                "Add more engaging hooks and storytelling elements",
-                "Include calls to action to encourage viewer interaction",
-                "Optimize video length for audience retention"
-            ])
-        
-        if scores["seo_effectiveness"] < 0.7:
-            recommendations.extend([
-                "Optimize title with relevant keywords",
-                "Expand video description with more details",
-                "Add more specific tags for better discoverability"
-            ])
+        for metric, suggestions in _RECOMMENDATIONS:
+            if scores[metric] < 0.7:
+                recommendations.extend(suggestions)
+                if len(recommendations) >= 5:
+                    break
         
         return recommendations[:5]  # Return top 5 recommendations
     
     async def compare_with_benchmark(self, evaluation: Dict[str, Any], benchmark: str = "youtube_educational") -> Dict[str, Any]:
         """Compare evaluation results with benchmarks"""
-        benchmarks = {
-            "youtube_educational": {
-                "content_quality": 0.75,
-                "production_value": 0.70,
-                "engagement_potential": 0.80,
-                "seo_effectiveness": 0.65,
-                "overall_score": 0.73
-            },
-            "youtube_viral": {
-                "content_quality": 0.70,
-                "production_value": 0.75,
-                "engagement_potential": 0.85,
-                "seo_effectiveness": 0.70,
-                "overall_score": 0.75
-            }
-        }
-        
-        benchmark_scores = benchmarks.get(benchmark, benchmarks["youtube_educational"])
+        benchmark_scores = _BENCHMARKS.get(benchmark, _BENCHMARKS["youtube_educational"])
         scores = evaluation["scores"]
         
         comparison = {
@@ -5,16 +5,19 @@ Main entry point for YouTube Video Generator Agent System
 
 import asyncio
 import logging
-from dotenv import load_dotenv
-from agents.video_production_team import VideoProductionTeam
-from memory.session_manager import SessionManager
-from observability.logger import setup_logging
-
-# Load environment variables
-load_dotenv()
 
 class YouTubeVideoGenerator:
     def __init__(self):
+        # Heavy imports are deferred until a generator is needed, so the
+        # interactive menu starts without loading the agents and tools
+        from dotenv import load_dotenv
+        from agents.video_production_team import VideoProductionTeam
+        from memory.session_manager import SessionManager
+        from observability.logger import setup_logging
+        
+        # Load environment variables
+        load_dotenv()
+        
         setup_logging()
         self.logger = logging.getLogger(__name__)
         self.session_manager = SessionManager()
@@ -25,14 +28,14 @@ class YouTubeVideoGenerator:
         self.logger.info(f"Starting video generation for topic: {topic}")
         
         # Create new session
-        session = await self.session_manager.create_session(
+        session = self.session_manager.create_session(
             topic=topic,
             target_duration=duration
         )
         
         try:
             # Execute video production workflow
-            result = await self.production_team.execute_workflow(session)
+            result = await self.production_team.execute_workflow(session, self.session_manager)
             
             self.logger.info("Video generation completed successfully")
             return {
@@ -53,7 +56,7 @@ class YouTubeVideoGenerator:
 
 async def main():
     """Interactive video generation"""
-    generator = YouTubeVideoGenerator()
+    generator = None
     
     print("\n" + "="*60)
     print("🎬 YouTube Agent System - Video Generator")
@@ -89,6 +92,8 @@ async def main():
             print("-" * 60)
             
             # Generate video
+            if generator is None:
+                generator = YouTubeVideoGenerator()
             result = await generator.generate_video(topic=topic, duration=duration)
             
             print("-" * 60)
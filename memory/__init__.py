@@ -3,9 +3,13 @@
 from .session_manager import SessionManager
 from .memory_bank import MemoryBank
 from .context_engineer import ContextManager
+from .tts_cache import TTSCache
+from .vector_index import VectorIndex
 
 __all__ = [
     'SessionManager',
     'MemoryBank',
-    'ContextManager'
+    'ContextManager',
+    'TTSCache',
+    'VectorIndex'
 ]
\ No newline at end of file
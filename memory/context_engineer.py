@@ -1,6 +1,41 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-import json
+from collections import OrderedDict
+import numpy as np
+from .memory_bank import MemoryBank, _dumps
+
+# Try to import numba to compile the priority ranking kernel
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Memory types each agent role needs in its context
+_RELEVANCE: Dict[str, frozenset] = {
+    "script_writer": frozenset({"research", "outline", "content"}),
+    "quality_validator": frozenset({"script", "production", "feedback"}),
+    "research_agent": frozenset({"topic", "requirements", "previous_research"})
+}
+
+# Key points and summaries are pure functions of content, so share them across
+# agents and managers, keyed by (helper, content hash)
+_DERIVED_CACHE_SIZE = 4096
+_derived_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+# Below this many memories the JIT dispatch costs more than it saves
+_NUMBA_MIN_MEMORIES = 512
+
+def _score(access_counts, important, recently_updated, role_match):
+    """Weighted priority score over the per-signal columns"""
+    return access_counts * 0.1 + important * 0.3 + recently_updated * 0.2 + role_match * 0.5
+
+if numba is not None:
+    _score_jit = numba.njit(cache=True)(_score)
+    
+    @numba.njit(cache=True)
+    def _score_and_rank(access_counts, important, recently_updated, role_match):
+        """Memory indices by descending priority (stable)"""
+        return np.argsort(-_score_jit(access_counts, important, recently_updated, role_match), kind="mergesort")
 
 class ContextManager:
     """Manage and engineer context for AI agents"""
@@ -10,17 +45,18 @@ class ContextManager:
         self.max_tokens = max_tokens
         self.compaction_strategy = compaction_strategy
         
-    async def prepare_agent_context(self, session_data: Dict[str, Any], 
+    async def prepare_agent_context(self, memory_bank: MemoryBank,
+                                  session_id: Optional[str],
                                   agent_role: str, 
                                   current_task: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare optimized context for an agent"""
         self.logger.debug(f"Preparing context for {agent_role}")
         
         # Get relevant memories
-        relevant_memories = await self._get_relevant_memories(session_data, agent_role)
+        relevant_memories = self._get_relevant_memories(memory_bank, session_id, agent_role)
         
         # Compact context if needed
-        compacted_context = await self._compact_context(
+        compacted_context = self._compact_context(
             relevant_memories, 
             current_task, 
             agent_role
@@ -33,44 +69,40 @@ class ContextManager:
         
         return structured_context
     
-    async def _get_relevant_memories(self, session_data: Dict[str, Any], agent_role: str) -> List[Dict[str, Any]]:
-        """Get memories relevant to the agent's role"""
-        memories = session_data.get("memories", [])
-        relevant_memories = []
-        
-        for memory in memories:
-            if self._is_relevant_to_agent(memory, agent_role):
-                relevant_memories.append(memory)
-        
-        return relevant_memories
-    
-    def _is_relevant_to_agent(self, memory: Dict[str, Any], agent_role: str) -> bool:
-        """Check if memory is relevant to agent's role"""
-        memory_type = memory.get("metadata", {}).get("type", "")
-        
-        relevance_map = {
-            "script_writer": ["research", "outline", "content"],
-            "quality_validator": ["script", "production", "feedback"],
-            "research_agent": ["topic", "requirements", "previous_research"]
-        }
-        
-        relevant_types = relevance_map.get(agent_role, [])
-        return memory_type in relevant_types
+    def _get_relevant_memories(self, memory_bank: MemoryBank, session_id: Optional[str],
+                               agent_role: str) -> List[Dict[str, Any]]:
+        """Get the session's memories relevant to the agent's role"""
+        relevant_types = _RELEVANCE.get(agent_role, frozenset())
+        if not relevant_types:
+            return []
+        
+        # Only the relevant memories are looked up (via the bank's type and
+        # session indexes); their content is shared, not copied
+        return [
+            {
+                "id": memory.id,
+                "content": memory.content,
+                "metadata": memory.metadata,
+                "token_estimate": memory.token_estimate,
+                "content_hash": memory.content_hash
+            }
+            for memory in memory_bank.get_memories_by_types(relevant_types, session_id)
+        ]
     
-    async def _compact_context(self, memories: List[Dict[str, Any]], 
-                             current_task: Dict[str, Any], 
-                             agent_role: str) -> Dict[str, Any]:
+    def _compact_context(self, memories: List[Dict[str, Any]], 
+                         current_task: Dict[str, Any], 
+                         agent_role: str) -> Dict[str, Any]:
         """Compact context using specified strategy"""
         if self.compaction_strategy == "semantic":
-            return await self._semantic_compaction(memories, current_task, agent_role)
+            return self._semantic_compaction(memories, current_task, agent_role)
         elif self.compaction_strategy == "priority":
-            return await self._priority_compaction(memories, current_task, agent_role)
+            return self._priority_compaction(memories, current_task, agent_role)
         else:
-            return await self._basic_compaction(memories)
+            return self._basic_compaction(memories)
     
-    async def _semantic_compaction(self, memories: List[Dict[str, Any]], 
-                                 current_task: Dict[str, Any], 
-                                 agent_role: str) -> Dict[str, Any]:
+    def _semantic_compaction(self, memories: List[Dict[str, Any]], 
+                             current_task: Dict[str, Any], 
+                             agent_role: str) -> Dict[str, Any]:
         """Semantic compaction focusing on task-relevant information"""
         compacted = {
             "task_objective": current_task.get("objective", ""),
@@ -81,33 +113,31 @@ class ContextManager:
         }
         
         for memory in memories:
-            memory_content = memory.get("content", {})
-            
             # Extract semantically important information
             if self._is_high_priority(memory, agent_role):
                 compacted["key_information"].append({
                     "type": memory.get("metadata", {}).get("type", ""),
-                    "content": self._extract_key_points(memory_content),
+                    "content": dict(self._cached_derive(memory, self._extract_key_points)),
                     "relevance": "high"
                 })
             else:
                 compacted["previous_work"].append({
                     "type": memory.get("metadata", {}).get("type", ""),
-                    "summary": self._summarize_memory(memory_content)
+                    "summary": self._cached_derive(memory, self._summarize_memory)
                 })
         
         return compacted
     
-    async def _priority_compaction(self, memories: List[Dict[str, Any]], 
-                                current_task: Dict[str, Any], 
-                                agent_role: str) -> Dict[str, Any]:
+    def _priority_compaction(self, memories: List[Dict[str, Any]], 
+                             current_task: Dict[str, Any], 
+                             agent_role: str) -> Dict[str, Any]:
         """Priority-based compaction"""
-        # Sort memories by priority
-        prioritized_memories = sorted(
-            memories,
-            key=lambda x: self._calculate_priority(x, agent_role),
-            reverse=True
-        )
+        # Sort memories by priority (stable, highest first)
+        if numba is not None and len(memories) >= _NUMBA_MIN_MEMORIES:
+            order = _score_and_rank(*self._priority_columns(memories, agent_role))
+        else:
+            order = np.argsort(-self._calculate_priorities(memories, agent_role), kind="stable")
+        prioritized_memories = [memories[i] for i in order]
         
         compacted = {}
         token_count = 0
@@ -127,7 +157,7 @@ class ContextManager:
         
         return compacted
     
-    async def _basic_compaction(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _basic_compaction(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Basic compaction - limit number of memories"""
         max_memories = self.max_tokens // 1000  # Rough estimate
         return memories[:max_memories]
@@ -146,13 +176,27 @@ class ContextManager:
     
     def _is_high_priority(self, memory: Dict[str, Any], agent_role: str) -> bool:
         """Determine if memory is high priority"""
-        priority_indicators = [
-            memory.get("metadata", {}).get("access_count", 0) > 5,
-            memory.get("metadata", {}).get("importance", "normal") == "high",
-            memory.get("metadata", {}).get("recently_updated", False)
-        ]
-        
-        return any(priority_indicators)
+        metadata = memory.get("metadata", {})
+        return bool(metadata.get("access_count", 0) > 5
+                    or metadata.get("importance", "normal") == "high"
+                    or metadata.get("recently_updated", False))
+    
+    def _cached_derive(self, memory: Dict[str, Any], derive) -> Any:
+        """Apply a content helper, reusing the result for content seen before"""
+        content_hash = memory.get("content_hash")
+        if not content_hash:
+            return derive(memory.get("content", {}))
+        
+        key = (derive.__name__, content_hash)
+        if key in _derived_cache:
+            _derived_cache.move_to_end(key)
+            return _derived_cache[key]
+        
+        result = derive(memory.get("content", {}))
+        _derived_cache[key] = result
+        if len(_derived_cache) > _DERIVED_CACHE_SIZE:
+            _derived_cache.popitem(last=False)
+        return result
     
     def _extract_key_points(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Extract key points from memory content"""
@@ -170,27 +214,38 @@ class ContextManager:
     def _summarize_memory(self, content: Dict[str, Any]) -> str:
         """Create a summary of memory content"""
         # Simplified summary - in production, use text summarization
-        content_str = json.dumps(content)
+        content_str = _dumps(content)
         if len(content_str) > 200:
             return content_str[:200] + "..."
         return content_str
     
-    def _calculate_priority(self, memory: Dict[str, Any], agent_role: str) -> float:
-        """Calculate priority score for memory"""
-        metadata = memory.get("metadata", {})
-        
-        score = 0.0
-        score += metadata.get("access_count", 0) * 0.1
-        score += 0.3 if metadata.get("importance") == "high" else 0.0
-        score += 0.2 if metadata.get("recently_updated", False) else 0.0
-        
+    def _calculate_priorities(self, memories: List[Dict[str, Any]], agent_role: str) -> np.ndarray:
+        """Calculate priority scores for all memories in one vectorized pass"""
+        return _score(*self._priority_columns(memories, agent_role))
+    
+    def _priority_columns(self, memories: List[Dict[str, Any]], agent_role: str) -> Tuple[np.ndarray, ...]:
+        """Priority signals as float64 columns (structure of arrays)"""
+        count = len(memories)
+        metadatas = [memory.get("metadata", {}) for memory in memories]
+        
+        access_counts = np.fromiter((metadata.get("access_count", 0) for metadata in metadatas),
+                                    dtype=np.float64, count=count)
+        important = np.fromiter((metadata.get("importance") == "high" for metadata in metadatas),
+                                dtype=np.float64, count=count)
+        recently_updated = np.fromiter((bool(metadata.get("recently_updated", False)) for metadata in metadatas),
+                                       dtype=np.float64, count=count)
         # Role-specific boosts
-        if agent_role in metadata.get("relevant_agents", []):
-            score += 0.5
+        role_match = np.fromiter((agent_role in metadata.get("relevant_agents", []) for metadata in metadatas),
+                                 dtype=np.float64, count=count)
         
-        return score
+        return access_counts, important, recently_updated, role_match
     
     def _estimate_tokens(self, memory: Dict[str, Any]) -> int:
         """Estimate token count for memory"""
-        content_str = json.dumps(memory)
+        # Memories dumped from MemoryBank carry an estimate computed at store time
+        token_estimate = memory.get("token_estimate")
+        if token_estimate:
+            return token_estimate
+        
+        content_str = _dumps(memory)
         return len(content_str) // 4  # Rough estimate
\ No newline at end of file
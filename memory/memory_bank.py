@@ -1,34 +1,118 @@
 import json
 import uuid
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import hashlib
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import logging
-from pydantic import BaseModel
+from collections import OrderedDict, defaultdict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+from .vector_index import VectorIndex
+
+# Try to import orjson for faster JSON encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Memories are split across shards, each with its own lock (power of two)
+_SHARD_COUNT = 64
+
+# Pending embeddings are encoded together once this many accumulate
+_EMBED_BATCH_SIZE = 32
+
+def _dumps(obj: Any, sort_keys: bool = False, default=None) -> str:
+    """Encode obj as compact JSON, with orjson when available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode()
+        except TypeError:
+            pass  # Values orjson rejects (e.g. >64-bit ints); let json decide
+    return json.dumps(obj, default=default, sort_keys=sort_keys, separators=(",", ":"))
+
+def _hashable(value: Any) -> bool:
+    """Whether value can key the session/type indexes"""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+# Search query split into (metadata pairs, content pairs)
+_CompiledQuery = Tuple[Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Any], ...]]
 
 class MemoryItem(BaseModel):
     """Individual memory item"""
+    # Built from trusted internal data: hot-path mutations skip re-validation
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+    
     id: str
     content: Dict[str, Any]
     metadata: Dict[str, Any]
-    created_at: str
-    accessed_at: str
+    created_at: int  # Nanoseconds since the epoch (time.time_ns())
+    accessed_at: int
     access_count: int = 0
+    token_estimate: int = 0
+    content_hash: str = ""  # blake2b of the canonical content JSON
+    
+    # Serialized content, cached until the content changes
+    _content_json: Optional[str] = PrivateAttr(default=None)
+    
+    def cache_content(self):
+        """Serialize content once and derive the token estimate and hash from it"""
+        self._content_json = _dumps(self.content, sort_keys=True, default=str)
+        self.token_estimate = len(self._content_json) // 4  # Rough estimate
+        self.content_hash = hashlib.blake2b(self._content_json.encode("utf-8"), digest_size=16).hexdigest()
 
 class MemoryBank:
     """Long-term memory storage for agent system"""
     
-    def __init__(self, vector_store_url: str = None):
+    def __init__(self, vector_store_url: str = None, max_items: int = 100_000):
         self.logger = logging.getLogger("memory_bank")
-        self.memories: Dict[str, MemoryItem] = {}
+        # Each shard is kept in recency order (least recently used first); the
+        # bank as a whole holds at most max_items, evicting the globally oldest
+        self._shards: List["OrderedDict[str, MemoryItem]"] = [OrderedDict() for _ in range(_SHARD_COUNT)]
+        self.max_items = max_items
+        self._locks = [threading.RLock() for _ in range(_SHARD_COUNT)]
         self.vector_store_url = vector_store_url
         
         # In production, this would connect to a vector database
         # self.vector_client = connect_to_vector_store(vector_store_url)
+        self.index = VectorIndex()
+        
+        # Memory ids per metadata.session_id, so session lookups skip the full scan
+        self._session_index: Dict[Any, List[str]] = defaultdict(list)
+        
+        # Memory ids per metadata.type, for role-relevance filtering
+        self._type_index: Dict[str, List[str]] = defaultdict(list)
+        
+        # Guards the vector, session and type indexes shared by all shards
+        self._index_lock = threading.RLock()
+        
+        # Texts waiting to be embedded, flushed in batches or before a query
+        self._pending_embeds: Dict[str, str] = {}
+        
+        # Running totals for get_stats, updated per operation
+        self._memory_count = 0
+        self._total_accesses = 0
+        self._stats_lock = threading.Lock()
+    
+    @property
+    def memories(self) -> Dict[str, MemoryItem]:
+        """Snapshot of all memories keyed by id"""
+        return dict(itertools.chain.from_iterable(shard.items() for shard in self._shards))
     
-    async def store(self, key: str, content: Dict[str, Any], metadata: Dict[str, Any] = None) -> str:
+    def _shard(self, memory_id: str) -> int:
+        """Shard number for a memory id (the leading UUID hex digits)"""
+        return int(memory_id[:8], 16) & (_SHARD_COUNT - 1)
+    
+    def store(self, key: str, content: Dict[str, Any], metadata: Dict[str, Any] = None) -> str:
         """Store content in memory bank"""
         memory_id = str(uuid.uuid4())
-        timestamp = datetime.now().isoformat()
+        timestamp = time.time_ns()
         
         memory_item = MemoryItem(
             id=memory_id,
@@ -38,77 +122,138 @@ class MemoryBank:
             accessed_at=timestamp
         )
         
-        self.memories[memory_id] = memory_item
+        memory_item.cache_content()
+        
+        shard = self._shard(memory_id)
+        with self._locks[shard]:
+            self._shards[shard][memory_id] = memory_item
+        with self._stats_lock:
+            self._memory_count += 1
+        with self._index_lock:
+            self._queue_embed(memory_id, memory_item._content_json)
+            self._index_metadata(memory_item)
         self.logger.debug(f"Stored memory: {memory_id}")
         
+        self._evict_overflow()
+        
         return memory_id
     
-    async def retrieve(self, memory_id: str) -> Optional[MemoryItem]:
+    def retrieve(self, memory_id: str) -> Optional[MemoryItem]:
         """Retrieve specific memory by ID"""
-        if memory_id not in self.memories:
-            return None
-        
-        memory = self.memories[memory_id]
-        
-        # Update access information
-        memory.accessed_at = datetime.now().isoformat()
-        memory.access_count += 1
+        shard = self._shard(memory_id)
+        with self._locks[shard]:
+            memory = self._shards[shard].get(memory_id)
+            if memory is None:
+                return None
+            self._shards[shard].move_to_end(memory_id)
+            
+            # Update access information
+            memory.accessed_at = time.time_ns()
+            memory.access_count += 1
+        with self._stats_lock:
+            self._total_accesses += 1
         
         self.logger.debug(f"Retrieved memory: {memory_id}")
         return memory
     
-    async def search(self, query: Dict[str, Any], limit: int = 10) -> List[MemoryItem]:
+    def search(self, query: Dict[str, Any], limit: int = 10) -> List[MemoryItem]:
         """Search memories based on query"""
         self.logger.debug(f"Searching memories with query: {query}")
         
-        results = []
-        
-        for memory in self.memories.values():
-            if self._matches_query(memory, query):
-                results.append(memory)
-            
-            if len(results) >= limit:
-                break
-        
-        # Sort by relevance (simplified - in production would use vector similarity)
-        results.sort(key=lambda x: x.access_count, reverse=True)
-        
-        return results
+        # Rank every match by access count, keeping only the top `limit`
+        compiled = self._compile_query(query)
+        matches = (memory for memory in self._candidates(query) if self._matches_query(memory, compiled))
+        return heapq.nlargest(limit, matches, key=lambda x: x.access_count)
     
-    async def update(self, memory_id: str, updates: Dict[str, Any]) -> bool:
+    async def search_async(self, query: Dict[str, Any], limit: int = 10) -> List[MemoryItem]:
+        """Awaitable search, the entry point for a remote vector-store backend"""
+        return self.search(query, limit)
+    
+    def semantic_search(self, query: Any, limit: int = 10) -> List[MemoryItem]:
+        """Find the memories most similar to a query dict or text, most similar first"""
+        text = query if isinstance(query, str) else self._memory_text(query)
+        with self._index_lock:
+            self.flush_embeds()
+            hits = self.index.query(text, k=limit)
+        # A hit may have been evicted or deleted since it was indexed
+        memories = (self._get(memory_id) for memory_id, _ in hits)
+        return [memory for memory in memories if memory is not None]
+    
+    def update(self, memory_id: str, updates: Dict[str, Any]) -> bool:
         """Update existing memory"""
-        if memory_id not in self.memories:
-            return False
-        
-        memory = self.memories[memory_id]
-        
-        # Update content and metadata
-        if "content" in updates:
-            memory.content.update(updates["content"])
-        
-        if "metadata" in updates:
-            memory.metadata.update(updates["metadata"])
-        
-        memory.accessed_at = datetime.now().isoformat()
+        shard = self._shard(memory_id)
+        with self._locks[shard]:
+            memory = self._shards[shard].get(memory_id)
+            if memory is None:
+                return False
+            self._shards[shard].move_to_end(memory_id)
+            
+            # Update content and metadata
+            if "content" in updates:
+                memory.content.update(updates["content"])
+                memory.cache_content()
+                with self._index_lock:
+                    self._queue_embed(memory_id, memory._content_json)
+            
+            if "metadata" in updates:
+                with self._index_lock:
+                    self._unindex_metadata(memory)
+                    memory.metadata.update(updates["metadata"])
+                    self._index_metadata(memory)
+            
+            memory.accessed_at = time.time_ns()
         
         self.logger.debug(f"Updated memory: {memory_id}")
         return True
     
-    async def delete(self, memory_id: str) -> bool:
+    def delete(self, memory_id: str) -> bool:
         """Delete memory by ID"""
-        if memory_id in self.memories:
-            del self.memories[memory_id]
+        shard = self._shard(memory_id)
+        with self._locks[shard]:
+            memory = self._shards[shard].pop(memory_id, None)
+        if memory is not None:
+            self._forget(memory)
             self.logger.debug(f"Deleted memory: {memory_id}")
             return True
         return False
     
-    async def get_session_memories(self, session_id: str) -> List[MemoryItem]:
+    def flush_embeds(self):
+        """Embed and index all pending memory texts in one batch"""
+        with self._index_lock:
+            if self._pending_embeds:
+                self.index.add_many(list(self._pending_embeds.items()))
+                self._pending_embeds.clear()
+    
+    def get_session_memories(self, session_id: str) -> List[MemoryItem]:
         """Get all memories for a specific session"""
-        return await self.search({"metadata.session_id": session_id})
+        if session_id is None or not _hashable(session_id):
+            # Not indexed: match it the way search does
+            query = {"metadata.session_id": session_id}
+            compiled = self._compile_query(query)
+            return [memory for memory in self._candidates(query) if self._matches_query(memory, compiled)]
+        with self._index_lock:
+            memory_ids = list(self._session_index.get(session_id, ()))
+        return self._get_many(memory_ids)
     
-    async def compact_context(self, session_id: str, max_tokens: int = 32000) -> Dict[str, Any]:
+    def get_memories_by_types(self, memory_types: Iterable[str],
+                              session_id: Optional[str] = None) -> List[MemoryItem]:
+        """Get memories whose metadata.type is one of memory_types, oldest first,
+        optionally restricted to one session"""
+        with self._index_lock:
+            memory_ids = [memory_id
+                          for memory_type in memory_types
+                          for memory_id in self._type_index.get(memory_type, ())]
+            if session_id is not None:
+                session_ids = set(self._session_index.get(session_id, ()))
+                memory_ids = [memory_id for memory_id in memory_ids if memory_id in session_ids]
+        
+        memories = self._get_many(memory_ids)
+        memories.sort(key=lambda x: x.created_at)
+        return memories
+    
+    def compact_context(self, session_id: str, max_tokens: int = 32000) -> Dict[str, Any]:
         """Compact context for a session to fit within token limits"""
-        memories = await self.get_session_memories(session_id)
+        memories = self.get_session_memories(session_id)
         
         if not memories:
             return {}
@@ -116,34 +261,125 @@ class MemoryBank:
         # Sort by importance (access count + recency)
         sorted_memories = sorted(
             memories,
-            key=lambda x: (
-                x.access_count,
-                datetime.fromisoformat(x.accessed_at).timestamp()
-            ),
+            key=lambda x: (x.access_count, x.accessed_at),
             reverse=True
         )
         
         # Compact memories to fit within token limits
-        compacted = await self._semantic_compaction(sorted_memories, max_tokens)
+        compacted = self._semantic_compaction(sorted_memories, max_tokens)
         
         return compacted
     
-    def _matches_query(self, memory: MemoryItem, query: Dict[str, Any]) -> bool:
-        """Check if memory matches search query"""
+    def _candidates(self, query: Dict[str, Any]) -> Iterable[MemoryItem]:
+        """Memories a query could match, narrowed by the session/type indexes when possible"""
+        for key, index in (("metadata.session_id", self._session_index), ("metadata.type", self._type_index)):
+            value = query.get(key)
+            # None also matches memories without the key, which the indexes do not
+            # hold, and unhashable values are never indexed
+            if value is not None and _hashable(value):
+                with self._index_lock:
+                    memory_ids = list(index.get(value, ()))
+                return self._get_many(memory_ids)
+        
+        return itertools.chain.from_iterable(shard.values() for shard in self._shards)
+    
+    def _queue_embed(self, memory_id: str, text: str):
+        """Queue a memory's text for embedding, flushing once a batch is full"""
+        self._pending_embeds[memory_id] = text
+        if len(self._pending_embeds) >= _EMBED_BATCH_SIZE:
+            self.flush_embeds()
+    
+    def _forget(self, memory: MemoryItem):
+        """Drop a memory already removed from its shard from the indexes and totals"""
+        with self._stats_lock:
+            self._memory_count -= 1
+            self._total_accesses -= memory.access_count
+        with self._index_lock:
+            self._unindex_metadata(memory)
+            if self._pending_embeds.pop(memory.id, None) is None:
+                self.index.remove(memory.id)
+    
+    def _get(self, memory_id: str) -> Optional[MemoryItem]:
+        """Look up a memory without touching its access information"""
+        return self._shards[self._shard(memory_id)].get(memory_id)
+    
+    def _get_many(self, memory_ids: Iterable[str]) -> List[MemoryItem]:
+        """Look up memories by id, skipping any removed since the ids were read"""
+        memories = (self._get(memory_id) for memory_id in memory_ids)
+        return [memory for memory in memories if memory is not None]
+    
+    def _evict_overflow(self):
+        """Evict least recently used memories, bank-wide, until at most max_items remain"""
+        while self._memory_count > self.max_items:
+            # Each shard's first entry is its least recently used one, so the
+            # bank's least recently used memory is the oldest of those
+            oldest = None
+            for shard, memories in enumerate(self._shards):
+                with self._locks[shard]:
+                    head = next(iter(memories.values()), None)
+                if head is not None and (oldest is None or head.accessed_at < oldest.accessed_at):
+                    oldest = head
+            if oldest is None:
+                return
+            
+            shard = self._shard(oldest.id)
+            with self._locks[shard]:
+                memory = self._shards[shard].pop(oldest.id, None)
+            if memory is not None:  # Another thread may have removed it first
+                self._forget(memory)
+                self.logger.debug(f"Evicted memory: {memory.id}")
+    
+    def _memory_text(self, content: Dict[str, Any]) -> str:
+        """Text embedded for a memory's content"""
+        return _dumps(content, sort_keys=True, default=str)
+    
+    def _index_keys(self, memory: MemoryItem) -> Iterable[Tuple[Dict[Any, List[str]], Any]]:
+        """(index, key) pairs a memory is filed under; unhashable values are left out"""
+        session_id = memory.metadata.get("session_id")
+        if session_id is not None and _hashable(session_id):
+            yield self._session_index, session_id
+        memory_type = memory.metadata.get("type", "unknown")
+        if _hashable(memory_type):
+            yield self._type_index, memory_type
+    
+    def _index_metadata(self, memory: MemoryItem):
+        """Add a memory to the session and type indexes"""
+        for index, key in self._index_keys(memory):
+            index[key].append(memory.id)
+    
+    def _unindex_metadata(self, memory: MemoryItem):
+        """Remove a memory from the session and type indexes"""
+        for index, key in self._index_keys(memory):
+            memory_ids = index.get(key)
+            if memory_ids and memory.id in memory_ids:
+                memory_ids.remove(memory.id)
+                if not memory_ids:
+                    del index[key]
+    
+    def _compile_query(self, query: Dict[str, Any]) -> _CompiledQuery:
+        """Split a search query into (metadata, content) key/value pairs once per search"""
+        metadata_pairs = []
+        content_pairs = []
         for key, value in query.items():
             if key.startswith("metadata."):
-                # Search in metadata
-                metadata_key = key[9:]  # Remove "metadata." prefix
-                if memory.metadata.get(metadata_key) != value:
-                    return False
+                metadata_pairs.append((key[9:], value))  # Remove "metadata." prefix
             else:
-                # Search in content
-                if memory.content.get(key) != value:
-                    return False
+                content_pairs.append((key, value))
         
-        return True
+        return tuple(metadata_pairs), tuple(content_pairs)
+    
+    def _matches_query(self, memory: MemoryItem,
+                       compiled: _CompiledQuery) -> bool:
+        """Check if memory matches a compiled search query"""
+        metadata_pairs, content_pairs = compiled
+        
+        # Metadata filters (session, type) are the most selective, so test them first
+        metadata = memory.metadata
+        content = memory.content
+        return (all(metadata.get(key) == value for key, value in metadata_pairs)
+                and all(content.get(key) == value for key, value in content_pairs))
     
-    async def _semantic_compaction(self, memories: List[MemoryItem], max_tokens: int) -> Dict[str, Any]:
+    def _semantic_compaction(self, memories: List[MemoryItem], max_tokens: int) -> Dict[str, Any]:
         """Perform semantic compaction of memories"""
         # Simplified compaction - in production, use NLP to summarize/compress
         compacted = {
@@ -156,9 +392,8 @@ class MemoryBank:
         token_count = 0
         
         for memory in memories:
-            # Estimate token count (very simplified)
-            content_str = json.dumps(memory.content)
-            memory_tokens = len(content_str) // 4  # Rough estimate
+            # Estimate token count (very simplified, cached at store time)
+            memory_tokens = memory.token_estimate
             
             if token_count + memory_tokens <= max_tokens:
                 # Extract key information based on memory type
@@ -180,8 +415,8 @@ class MemoryBank:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get memory bank statistics"""
-        total_memories = len(self.memories)
-        total_accesses = sum(memory.access_count for memory in self.memories.values())
+        total_memories = self._memory_count
+        total_accesses = self._total_accesses
         
         return {
             "total_memories": total_memories,
@@ -192,8 +427,5 @@ class MemoryBank:
     
     def _get_memory_type_distribution(self) -> Dict[str, int]:
         """Get distribution of memory types"""
-        distribution = {}
-        for memory in self.memories.values():
-            memory_type = memory.metadata.get("type", "unknown")
-            distribution[memory_type] = distribution.get(memory_type, 0) + 1
-        return distribution
\ No newline at end of file
+        with self._index_lock:
+            return {memory_type: len(memory_ids) for memory_type, memory_ids in self._type_index.items()}
\ No newline at end of file
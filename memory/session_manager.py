@@ -1,11 +1,15 @@
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-from pydantic import BaseModel
+from collections import OrderedDict
+from pydantic import BaseModel, ConfigDict
 
 class SessionState(BaseModel):
     """Session state model"""
+    # Built from trusted internal data: hot-path mutations skip re-validation
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+    
     session_id: str
     topic: str
     created_at: str
@@ -17,14 +21,18 @@ class SessionState(BaseModel):
 class SessionManager:
     """Manage agent sessions and state"""
     
-    def __init__(self, redis_url: str = None):
+    def __init__(self, redis_url: str = None, max_sessions: int = 10_000):
         self.logger = logging.getLogger("session_manager")
-        self.sessions: Dict[str, SessionState] = {}
+        # LRU order: the least recently used session is evicted past max_sessions
+        self.sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        self.max_sessions = max_sessions
+        # Phase updates buffered per session until flush_phases applies them
+        self._pending_phases: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
         
         # In a real implementation, this would connect to Redis
         # self.redis_client = redis.Redis.from_url(redis_url) if redis_url else None
     
-    async def create_session(self, topic: str, target_duration: int = 600) -> SessionState:
+    def create_session(self, topic: str, target_duration: int = 600) -> SessionState:
         """Create a new video production session"""
         session_id = str(uuid.uuid4())
         
@@ -45,15 +53,21 @@ class SessionManager:
         self.sessions[session_id] = session
         self.logger.info(f"Created new session: {session_id} for topic: {topic}")
         
+        while len(self.sessions) > self.max_sessions:
+            evicted_id, _ = self.sessions.popitem(last=False)
+            self._pending_phases.pop(evicted_id, None)
+            self.logger.debug(f"Evicted session: {evicted_id}")
+        
         return session
     
-    async def update_session(self, session_id: str, updates: Dict[str, Any]) -> Optional[SessionState]:
+    def update_session(self, session_id: str, updates: Dict[str, Any]) -> Optional[SessionState]:
         """Update session state"""
         if session_id not in self.sessions:
             self.logger.error(f"Session not found: {session_id}")
             return None
         
         session = self.sessions[session_id]
+        self.sessions.move_to_end(session_id)
         
         # Update session fields
         for key, value in updates.items():
@@ -65,13 +79,35 @@ class SessionManager:
         self.logger.debug(f"Updated session: {session_id}")
         return session
     
-    async def get_session(self, session_id: str) -> Optional[SessionState]:
+    def record_phase(self, session_id: str, phase: str, updates: Dict[str, Any] = None):
+        """Buffer a completed workflow phase; applied by flush_phases"""
+        self._pending_phases.setdefault(session_id, []).append((phase, updates or {}))
+    
+    def flush_phases(self, session_id: str) -> Optional[SessionState]:
+        """Apply all buffered phase updates to the session in a single update"""
+        phases = self._pending_phases.pop(session_id, None)
+        if not phases or session_id not in self.sessions:
+            return self.sessions.get(session_id)
+        
+        # Later phases win for fields set more than once
+        updates: Dict[str, Any] = {}
+        for _, phase_updates in phases:
+            updates.update(phase_updates)
+        updates["current_stage"] = phases[-1][0]
+        self.sessions[session_id].metadata["stages_completed"].extend(phase for phase, _ in phases)
+        
+        return self.update_session(session_id, updates)
+    
+    def get_session(self, session_id: str) -> Optional[SessionState]:
         """Retrieve session by ID"""
-        return self.sessions.get(session_id)
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.sessions.move_to_end(session_id)
+        return session
     
-    async def pause_session(self, session_id: str) -> bool:
+    def pause_session(self, session_id: str) -> bool:
         """Pause a session"""
-        session = await self.get_session(session_id)
+        session = self.get_session(session_id)
         if not session:
             return False
         
@@ -81,9 +117,9 @@ class SessionManager:
         self.logger.info(f"Paused session: {session_id}")
         return True
     
-    async def resume_session(self, session_id: str) -> bool:
+    def resume_session(self, session_id: str) -> bool:
         """Resume a paused session"""
-        session = await self.get_session(session_id)
+        session = self.get_session(session_id)
         if not session:
             return False
         
@@ -0,0 +1,111 @@
+import os
+import shutil
+import hashlib
+from collections import Counter
+from typing import Awaitable, Callable, Optional
+import logging
+
+class TTSCache:
+    """
+    Content-addressed on-disk cache of synthesized speech
+    
+    Eviction is least-frequently-used by hit counts kept in this process only;
+    after a restart every entry starts at zero, so eviction falls back to
+    least-recently-used (file mtime) until counts build up again.
+    """
+    
+    def __init__(self, cache_dir: str = "cache/tts", max_bytes: int = 512 * 1024 * 1024,
+                 extension: str = ".mp3"):
+        self.logger = logging.getLogger("tts_cache")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits: Counter = Counter()  # Use counts for LFU eviction
+        self._total_bytes: Optional[int] = None  # Cache size, scanned on first put
+    
+    def key(self, text: str, voice: str) -> str:
+        """Cache key for a (voice, text) pair"""
+        return hashlib.blake2b((voice + "\0" + text).encode("utf-8"), digest_size=16).hexdigest()
+    
+    def path_for(self, text: str, voice: str) -> str:
+        """Location of the cached audio for a (voice, text) pair"""
+        return os.path.join(self.cache_dir, self.key(text, voice) + self.extension)
+    
+    def get(self, text: str, voice: str) -> Optional[str]:
+        """Return the cached audio path, or None on a miss"""
+        path = self.path_for(text, voice)
+        if not os.path.exists(path):
+            return None
+        
+        self.hits[os.path.basename(path)] += 1
+        os.utime(path)  # Recency breaks LFU ties
+        self.logger.debug(f"TTS cache hit: {path}")
+        return path
+    
+    def put(self, text: str, voice: str, audio_path: str) -> Optional[str]:
+        """Copy synthesized audio into the cache and return its cached path"""
+        if not audio_path or not os.path.exists(audio_path):
+            return None
+        
+        path = self.path_for(text, voice)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Copy to a temp name first so readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            shutil.copyfile(audio_path, temp_path)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            self.logger.warning(f"Could not cache TTS audio: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        
+        self.hits[os.path.basename(path)] += 1
+        
+        # The directory is only scanned when the running total says it is full
+        if self._total_bytes is None:
+            self._evict()
+        else:
+            self._total_bytes += size - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return path
+    
+    async def get_or_synth(self, text: str, voice: str,
+                           synthesize: Callable[[str], Awaitable[str]]) -> str:
+        """Return cached audio for text, synthesizing and caching it on a miss"""
+        cached = self.get(text, voice)
+        if cached:
+            return cached
+        
+        audio_path = await synthesize(text)
+        if audio_path:
+            self.put(text, voice, audio_path)
+        return audio_path
+    
+    def _evict(self):
+        """Remove least-frequently-used entries until the cache fits max_bytes,
+        and resynchronize the running size total with the directory"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(self.extension):
+                stat = entry.stat()
+                entries.append((self.hits[entry.name], stat.st_mtime, stat.st_size, entry.path, entry.name))
+                total += stat.st_size
+        
+        for _, _, size, path, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.hits.pop(name, None)
+            total -= size
+            self.logger.debug(f"Evicted TTS cache entry: {path}")
+        
+        self._total_bytes = total
@@ -0,0 +1,158 @@
+import re
+import zlib
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Try to import hnswlib for approximate nearest-neighbour search
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+# Try to import sentence-transformers for semantic embeddings
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Encoders are loaded once per model name and shared by every index
+_ENCODERS: Dict[str, "SentenceTransformer"] = {}
+_ENCODER_LOCK = threading.Lock()
+
+def _get_encoder(model_name: str) -> "SentenceTransformer":
+    """Return the shared encoder for model_name, loading it on first use"""
+    encoder = _ENCODERS.get(model_name)
+    if encoder is None:
+        with _ENCODER_LOCK:
+            encoder = _ENCODERS.get(model_name)
+            if encoder is None:
+                encoder = _ENCODERS[model_name] = SentenceTransformer(model_name)
+    return encoder
+
+class VectorIndex:
+    """
+    Nearest-neighbour index over text embeddings
+    
+    Uses a sentence-transformer encoder and an HNSW graph when available;
+    otherwise falls back to hashed bag-of-words vectors and an exact
+    cosine scan so retrieval still works without the optional packages.
+    """
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", hashed_dim: int = 256,
+                 max_elements: int = 1024, M: int = 16, ef_construction: int = 64, ef: int = 50):
+        self.logger = logging.getLogger("vector_index")
+        self.model_name = model_name
+        self.hashed_dim = hashed_dim
+        self.max_elements = max_elements
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        
+        self._index = None
+        self._next_label = 0
+        self._labels: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+        
+        # Exact-scan fallback: one vector per live label
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    
+    def __len__(self) -> int:
+        return len(self._labels)
+    
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts as L2-normalized float32 rows"""
+        if SentenceTransformer is not None:
+            return _get_encoder(self.model_name).encode(list(texts), batch_size=32, convert_to_numpy=True,
+                                                        normalize_embeddings=True).astype(np.float32)
+        
+        vectors = np.zeros((len(texts), self.hashed_dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets = [zlib.crc32(token.encode("utf-8")) % self.hashed_dim
+                       for token in _TOKEN_RE.findall(text.lower())]
+            np.add.at(vectors[row], buckets, 1.0)
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+    
+    def add(self, key: str, text: str):
+        """Index text under key, replacing any previous entry for key"""
+        self.add_many([(key, text)])
+    
+    def add_many(self, items: Sequence[Tuple[str, str]]):
+        """Index (key, text) pairs with one batched embedding call"""
+        items = list(dict(items).items())  # Last text wins for repeated keys
+        if not items:
+            return
+        
+        for key, _ in items:
+            self.remove(key)
+        vectors = self.embed([text for _, text in items])
+        
+        labels = np.arange(self._next_label, self._next_label + len(items))
+        self._next_label += len(items)
+        for (key, _), label in zip(items, labels.tolist()):
+            self._labels[key] = label
+            self._keys[label] = key
+        
+        if hnswlib is not None:
+            self._ensure_index(vectors.shape[1])
+            needed = self._index.get_current_count() + len(items)
+            if needed > self._index.get_max_elements():
+                self._index.resize_index(max(needed, self._index.get_max_elements() * 2))
+            self._index.add_items(vectors, labels)
+        else:
+            self._vectors.update(zip(labels.tolist(), vectors))
+            self._matrix = None
+    
+    def remove(self, key: str) -> bool:
+        """Drop key from the index (HNSW entries are tombstoned)"""
+        label = self._labels.pop(key, None)
+        if label is None:
+            return False
+        
+        del self._keys[label]
+        if hnswlib is not None:
+            self._index.mark_deleted(label)
+        else:
+            del self._vectors[label]
+            self._matrix = None
+        return True
+    
+    def query(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to k (key, cosine similarity) pairs, most similar first"""
+        k = min(k, len(self._labels))
+        if k <= 0:
+            return []
+        
+        vector = self.embed([text])[0]
+        
+        if hnswlib is not None:
+            self._index.set_ef(max(self.ef, k))
+            labels, distances = self._index.knn_query(vector[np.newaxis, :], k=k)
+            return [(self._keys[int(label)], 1.0 - float(distance))
+                    for label, distance in zip(labels[0], distances[0])]
+        
+        if self._matrix is None:
+            labels = np.fromiter(self._vectors.keys(), dtype=np.int64, count=len(self._vectors))
+            self._matrix = (labels, np.stack(list(self._vectors.values())))
+        labels, matrix = self._matrix
+        
+        similarities = matrix @ vector
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(self._keys[int(labels[i])], float(similarities[i])) for i in top]
+    
+    def _ensure_index(self, dim: int):
+        """Create the HNSW graph on first insert, once the embedding size is known"""
+        if self._index is not None:
+            return
+        
+        self._index = hnswlib.Index(space="cosine", dim=dim)
+        self._index.init_index(max_elements=self.max_elements, ef_construction=self.ef_construction, M=self.M)
+        self._index.set_ef(self.ef)
+        self.logger.debug(f"Created HNSW index (dim={dim})")
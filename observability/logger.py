@@ -5,18 +5,64 @@ from datetime import datetime
 from typing import Dict, Any
 import os
 
+# Try to import orjson for faster JSON encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    """Encode a log payload as JSON"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode()
+    return json.dumps(payload, default=str)
+
+class _JSONMessage:
+    """Log message that encodes its payload only if the record is emitted"""
+    __slots__ = ("payload",)
+    
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+    
+    def __str__(self) -> str:
+        return _dumps(self.payload)
+
+class _JSONFormatter(logging.Formatter):
+    """Format records as one JSON object, nesting structured payloads as-is"""
+    
+    def __init__(self):
+        super().__init__(datefmt='%Y-%m-%d %H:%M:%S')
+    
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, _JSONMessage) and not record.args:
+            message = record.msg.payload
+        else:
+            message = record.getMessage()
+        
+        entry = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": message
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return _dumps(entry)
+
 class StructuredLogger:
     """Structured logging for agent system observability"""
     
     def __init__(self, name: str, level: str = "INFO", log_file: str = None):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, level.upper()))
+        # Records go to this logger's own handlers only, never twice via root
+        self.logger.propagate = False
         
-        # Create formatter
-        formatter = logging.Formatter(
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": %(message)s}',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        # Reuse handlers from an earlier instance for the same logger
+        if self.logger.handlers:
+            return
+        
+        formatter = _JSONFormatter()
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -31,7 +77,10 @@ class StructuredLogger:
     
     def log_agent_start(self, agent_name: str, task: Dict[str, Any], session_id: str):
         """Log agent execution start"""
-        self.logger.info(json.dumps({
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        self.logger.info(_JSONMessage({
             "event": "agent_start",
             "agent": agent_name,
             "session_id": session_id,
@@ -41,7 +90,10 @@ class StructuredLogger:
     
     def log_agent_end(self, agent_name: str, result: Dict[str, Any], session_id: str, duration: float):
         """Log agent execution completion"""
-        self.logger.info(json.dumps({
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        self.logger.info(_JSONMessage({
             "event": "agent_end", 
             "agent": agent_name,
             "session_id": session_id,
@@ -53,7 +105,10 @@ class StructuredLogger:
     
     def log_tool_usage(self, tool_name: str, parameters: Dict[str, Any], success: bool, duration: float):
         """Log tool usage"""
-        self.logger.debug(json.dumps({
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        self.logger.debug(_JSONMessage({
             "event": "tool_usage",
             "tool": tool_name,
             "parameters": parameters,
@@ -64,7 +119,10 @@ class StructuredLogger:
     
     def log_quality_check(self, session_id: str, quality_score: float, iteration: int):
         """Log quality validation results"""
-        self.logger.info(json.dumps({
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        self.logger.info(_JSONMessage({
             "event": "quality_validation",
             "session_id": session_id,
             "quality_score": quality_score,
@@ -74,7 +132,10 @@ class StructuredLogger:
     
     def log_error(self, component: str, error: str, context: Dict[str, Any] = None):
         """Log error with context"""
-        self.logger.error(json.dumps({
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        
+        self.logger.error(_JSONMessage({
             "event": "error",
             "component": component,
             "error": error,
@@ -84,7 +145,10 @@ class StructuredLogger:
     
     def log_metrics(self, metrics: Dict[str, Any]):
         """Log custom metrics"""
-        self.logger.info(json.dumps({
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        self.logger.info(_JSONMessage({
             "event": "metrics",
             "metrics": metrics,
             "timestamp": datetime.now().isoformat()
@@ -97,13 +161,13 @@ def setup_logging(level: str = "INFO", log_file: str = None):
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
     
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        *( [logging.FileHandler(log_file)] if log_file else [] )
+    ]
+    formatter = _JSONFormatter()
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
     # Basic configuration
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": %(message)s}',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            *( [logging.FileHandler(log_file)] if log_file else [] )
-        ]
-    )
\ No newline at end of file
+    logging.basicConfig(level=getattr(logging, level.upper()), handlers=handlers)
\ No newline at end of file
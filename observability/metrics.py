@@ -1,121 +1,160 @@
+import io
+import sys
 import time
 import json
-from typing import Dict, Any, List
+from typing import Deque, Dict, Any, List, Optional, Tuple
 import logging
+from collections import deque
+from dataclasses import asdict, dataclass
 from datetime import datetime
 import asyncio
+import numpy as np
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    """Render an epoch timestamp recorded on the hot path as ISO 8601"""
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
+
+@dataclass(slots=True)
+class AgentStat:
+    """Running totals for one agent, written on every record (hot fields only)"""
+    execution_count: int = 0
+    total_duration_ns: int = 0
+    success_count: int = 0
+    error_count: int = 0
+    total_output_size: int = 0
+
+@dataclass(slots=True)
+class ToolStat:
+    """Running totals for one tool"""
+    usage_count: int = 0
+    total_duration: float = 0.0
+    success_count: int = 0
+    error_count: int = 0
+    last_used: Optional[float] = None  # Epoch seconds
+
+@dataclass(slots=True)
+class QualityStat:
+    """Final quality validation result for one session"""
+    final_quality_score: float
+    iterations_required: int
+    evaluated_at: float  # Epoch seconds
+
+@dataclass(slots=True)
+class MemoryStat:
+    """Running totals for one memory operation"""
+    operation_count: int = 0
+    total_duration: float = 0.0
+    success_count: int = 0
+    error_count: int = 0
 
 class MetricsCollector:
     """Collect and report system metrics"""
     
-    def __init__(self):
+    def __init__(self, history_cap: int = 1024):
         self.logger = logging.getLogger("metrics_collector")
-        self.metrics: Dict[str, Any] = {}
-        self.historical_data: List[Dict[str, Any]] = []
+        # One dict per metric kind, keyed by bare agent/tool/session/operation
+        # name (interned on first record), so no prefixed key is built per call
+        self.agent_metrics: Dict[str, AgentStat] = {}
+        self.tool_metrics: Dict[str, ToolStat] = {}
+        self.quality_metrics: Dict[str, QualityStat] = {}
+        self.memory_metrics: Dict[str, MemoryStat] = {}
+        
+        # Derived agent stats, valid while execution_count is unchanged
+        self._stats_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        
+        # Epoch seconds of each agent's last execution, kept apart from the counters
+        self.agent_last_seen: Dict[str, float] = {}
+        
+        # Prometheus label sets per agent, built on first scrape
+        self._prom_label_cache: Dict[str, str] = {}
+        
+        # Most recent reports only; the oldest drop off once history_cap is reached
+        self.history_cap = history_cap
+        self.historical_data: Deque[Dict[str, Any]] = deque(maxlen=history_cap)
         
     def record_agent_metrics(self, agent_name: str, duration: float, success: bool, output_size: int):
         """Record metrics for agent execution"""
-        key = f"agent_{agent_name}"
-        if key not in self.metrics:
-            self.metrics[key] = {
-                "execution_count": 0,
-                "total_duration": 0,
-                "success_count": 0,
-                "error_count": 0,
-                "total_output_size": 0,
-                "last_execution": None
-            }
-        
-        self.metrics[key]["execution_count"] += 1
-        self.metrics[key]["total_duration"] += duration
-        self.metrics[key]["total_output_size"] += output_size
-        self.metrics[key]["last_execution"] = datetime.now().isoformat()
+        stat = self.agent_metrics.get(agent_name)
+        if stat is None:
+            stat = self.agent_metrics[sys.intern(agent_name)] = AgentStat()
+        
+        stat.execution_count += 1
+        stat.total_duration_ns += int(duration * 1_000_000_000)
+        stat.total_output_size += output_size
+        self.agent_last_seen[agent_name] = time.time()
         
         if success:
-            self.metrics[key]["success_count"] += 1
+            stat.success_count += 1
         else:
-            self.metrics[key]["error_count"] += 1
+            stat.error_count += 1
     
     def record_tool_metrics(self, tool_name: str, duration: float, success: bool):
         """Record metrics for tool usage"""
-        key = f"tool_{tool_name}"
-        if key not in self.metrics:
-            self.metrics[key] = {
-                "usage_count": 0,
-                "total_duration": 0,
-                "success_count": 0,
-                "error_count": 0,
-                "last_used": None
-            }
-        
-        self.metrics[key]["usage_count"] += 1
-        self.metrics[key]["total_duration"] += duration
-        self.metrics[key]["last_used"] = datetime.now().isoformat()
+        stat = self.tool_metrics.get(tool_name)
+        if stat is None:
+            stat = self.tool_metrics[sys.intern(tool_name)] = ToolStat()
+        
+        stat.usage_count += 1
+        stat.total_duration += duration
+        stat.last_used = time.time()
         
         if success:
-            self.metrics[key]["success_count"] += 1
+            stat.success_count += 1
         else:
-            self.metrics[key]["error_count"] += 1
+            stat.error_count += 1
     
     def record_quality_metrics(self, session_id: str, quality_score: float, iteration: int):
         """Record quality validation metrics"""
-        key = f"quality_{session_id}"
-        self.metrics[key] = {
-            "final_quality_score": quality_score,
-            "iterations_required": iteration,
-            "evaluated_at": datetime.now().isoformat()
-        }
+        self.quality_metrics[session_id] = QualityStat(quality_score, iteration, time.time())
     
     def record_memory_metrics(self, operation: str, duration: float, success: bool):
         """Record memory operations metrics"""
-        key = f"memory_{operation}"
-        if key not in self.metrics:
-            self.metrics[key] = {
-                "operation_count": 0,
-                "total_duration": 0,
-                "success_count": 0,
-                "error_count": 0
-            }
-        
-        self.metrics[key]["operation_count"] += 1
-        self.metrics[key]["total_duration"] += duration
+        stat = self.memory_metrics.get(operation)
+        if stat is None:
+            stat = self.memory_metrics[sys.intern(operation)] = MemoryStat()
+        
+        stat.operation_count += 1
+        stat.total_duration += duration
         
         if success:
-            self.metrics[key]["success_count"] += 1
+            stat.success_count += 1
         else:
-            self.metrics[key]["error_count"] += 1
+            stat.error_count += 1
     
     def get_agent_stats(self, agent_name: str) -> Dict[str, Any]:
         """Get statistics for specific agent"""
-        key = f"agent_{agent_name}"
-        if key not in self.metrics:
+        data = self.agent_metrics.get(agent_name)
+        if data is None:
             return {}
         
-        data = self.metrics[key]
-        avg_duration = data["total_duration"] / data["execution_count"]
-        success_rate = data["success_count"] / data["execution_count"]
-        avg_output_size = data["total_output_size"] / data["execution_count"]
+        # Every record bumps execution_count, so an equal count means nothing changed
+        cached = self._stats_cache.get(agent_name)
+        if cached is not None and cached[0] == data.execution_count:
+            return dict(cached[1])
         
-        return {
+        avg_duration = data.total_duration_ns / 1e9 / data.execution_count
+        success_rate = data.success_count / data.execution_count
+        avg_output_size = data.total_output_size / data.execution_count
+        
+        stats = {
             "agent_name": agent_name,
-            "execution_count": data["execution_count"],
+            "execution_count": data.execution_count,
             "average_duration": round(avg_duration, 2),
             "success_rate": round(success_rate, 2),
             "average_output_size": round(avg_output_size, 2),
-            "last_execution": data["last_execution"]
+            "last_execution": _iso(self.agent_last_seen.get(agent_name))
         }
+        self._stats_cache[agent_name] = (data.execution_count, stats)
+        return dict(stats)
     
     def get_system_health(self) -> Dict[str, Any]:
         """Get overall system health metrics"""
-        agent_metrics = {k: v for k, v in self.metrics.items() if k.startswith("agent_")}
-        tool_metrics = {k: v for k, v in self.metrics.items() if k.startswith("tool_")}
-        
-        total_agent_executions = sum(m["execution_count"] for m in agent_metrics.values())
-        total_tool_usages = sum(m["usage_count"] for m in tool_metrics.values())
+        total_agent_executions = sum(m.execution_count for m in self.agent_metrics.values())
+        total_tool_usages = sum(m.usage_count for m in self.tool_metrics.values())
         
         return {
-            "total_agents": len(agent_metrics),
-            "total_tools": len(tool_metrics),
+            "total_agents": len(self.agent_metrics),
+            "total_tools": len(self.tool_metrics),
             "total_agent_executions": total_agent_executions,
             "total_tool_usages": total_tool_usages,
             "system_uptime": self._get_uptime(),
@@ -134,22 +173,16 @@ class MetricsCollector:
         }
         
         # Agent performance
-        for key in self.metrics:
-            if key.startswith("agent_"):
-                agent_name = key[6:]  # Remove "agent_" prefix
-                report["agent_performance"][agent_name] = self.get_agent_stats(agent_name)
+        for agent_name in self.agent_metrics:
+            report["agent_performance"][agent_name] = self.get_agent_stats(agent_name)
         
         # Tool usage
-        for key in self.metrics:
-            if key.startswith("tool_"):
-                tool_name = key[5:]  # Remove "tool_" prefix
-                report["tool_usage"][tool_name] = self.metrics[key]
+        for tool_name, data in self.tool_metrics.items():
+            report["tool_usage"][tool_name] = {**asdict(data), "last_used": _iso(data.last_used)}
         
         # Quality metrics
-        for key in self.metrics:
-            if key.startswith("quality_"):
-                session_id = key[8:]  # Remove "quality_" prefix
-                report["quality_metrics"][session_id] = self.metrics[key]
+        for session_id, data in self.quality_metrics.items():
+            report["quality_metrics"][session_id] = {**asdict(data), "evaluated_at": _iso(data.evaluated_at)}
         
         # Generate recommendations
         report["recommendations"] = self._generate_recommendations()
@@ -163,30 +196,35 @@ class MetricsCollector:
         """Generate system improvement recommendations based on metrics"""
         recommendations = []
         
-        # Analyze agent performance
-        for key in self.metrics:
-            if key.startswith("agent_"):
-                data = self.metrics[key]
-                success_rate = data["success_count"] / data["execution_count"]
-                
-                if success_rate < 0.7:
-                    agent_name = key[6:]
-                    recommendations.append(f"Improve reliability of {agent_name} agent (success rate: {success_rate:.2f})")
-                
-                avg_duration = data["total_duration"] / data["execution_count"]
-                if avg_duration > 30:  # More than 30 seconds average
-                    agent_name = key[6:]
-                    recommendations.append(f"Optimize performance of {agent_name} agent (avg duration: {avg_duration:.2f}s)")
+        # Analyze agent performance: one vectorized pass over count columns,
+        # formatting messages only for the flagged agents
+        agent_names = list(self.agent_metrics)
+        if agent_names:
+            stats = self.agent_metrics.values()
+            count = len(agent_names)
+            executions = np.maximum(np.fromiter((stat.execution_count for stat in stats), dtype=np.float64, count=count), 1)
+            success_rates = np.fromiter((stat.success_count for stat in stats), dtype=np.float64, count=count) / executions
+            avg_durations = np.fromiter((stat.total_duration_ns for stat in stats), dtype=np.float64, count=count) / 1e9 / executions
+            
+            unreliable = success_rates < 0.7
+            slow = avg_durations > 30  # More than 30 seconds average
+            for i in np.flatnonzero(unreliable | slow).tolist():
+                agent_name = agent_names[i]
+                if unreliable[i]:
+                    recommendations.append(f"Improve reliability of {agent_name} agent (success rate: {success_rates[i]:.2f})")
+                if slow[i]:
+                    recommendations.append(f"Optimize performance of {agent_name} agent (avg duration: {avg_durations[i]:.2f}s)")
         
         # Analyze tool usage
-        for key in self.metrics:
-            if key.startswith("tool_"):
-                data = self.metrics[key]
-                error_rate = data["error_count"] / data["usage_count"]
-                
-                if error_rate > 0.3:
-                    tool_name = key[5:]
-                    recommendations.append(f"Address reliability issues with {tool_name} tool (error rate: {error_rate:.2f})")
+        tool_names = list(self.tool_metrics)
+        if tool_names:
+            stats = self.tool_metrics.values()
+            count = len(tool_names)
+            usages = np.maximum(np.fromiter((stat.usage_count for stat in stats), dtype=np.float64, count=count), 1)
+            error_rates = np.fromiter((stat.error_count for stat in stats), dtype=np.float64, count=count) / usages
+            
+            for i in np.flatnonzero(error_rates > 0.3).tolist():
+                recommendations.append(f"Address reliability issues with {tool_names[i]} tool (error rate: {error_rates[i]:.2f})")
         
         return recommendations
     
@@ -208,18 +246,22 @@ class MetricsCollector:
     
     def _format_prometheus(self, report: Dict[str, Any]) -> str:
         """Format metrics for Prometheus"""
-        lines = []
+        buffer = io.StringIO()
+        write = buffer.write
         
         # System metrics
         health = report["system_health"]
-        lines.append(f'system_agents_total {health["total_agents"]}')
-        lines.append(f'system_tools_total {health["total_tools"]}')
-        lines.append(f'system_agent_executions_total {health["total_agent_executions"]}')
+        write(f'system_agents_total {health["total_agents"]}\n'
+              f'system_tools_total {health["total_tools"]}\n'
+              f'system_agent_executions_total {health["total_agent_executions"]}\n')
         
         # Agent metrics
         for agent_name, stats in report["agent_performance"].items():
-            lines.append(f'agent_executions_total{{agent="{agent_name}"}} {stats["execution_count"]}')
-            lines.append(f'agent_success_rate{{agent="{agent_name}"}} {stats["success_rate"]}')
-            lines.append(f'agent_avg_duration_seconds{{agent="{agent_name}"}} {stats["average_duration"]}')
+            labels = self._prom_label_cache.get(agent_name)
+            if labels is None:
+                labels = self._prom_label_cache[agent_name] = f'{{agent="{agent_name}"}}'
+            write(f'agent_executions_total{labels} {stats["execution_count"]}\n'
+                  f'agent_success_rate{labels} {stats["success_rate"]}\n'
+                  f'agent_avg_duration_seconds{labels} {stats["average_duration"]}\n')
         
-        return "\n".join(lines)
\ No newline at end of file
+        return buffer.getvalue()
@@ -1,29 +1,33 @@
 import time
-import uuid
-import json
+import secrets
+import itertools
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional, Callable, List
 import logging
 from functools import wraps
+from .logger import _dumps
 
 class Span:
     """Represents a single operation in a trace"""
+    __slots__ = ("trace_id", "span_id", "name", "parent_id", "start_ns", "end_ns",
+                 "attributes", "events", "status")
     
     def __init__(self, trace_id: str, span_id: str, name: str, parent_id: str = None):
         self.trace_id = trace_id
         self.span_id = span_id
         self.name = name
         self.parent_id = parent_id
-        self.start_time = time.time()
-        self.end_time: Optional[float] = None
+        # Monotonic clock readings (time.perf_counter_ns())
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
         self.attributes: Dict[str, Any] = {}
         self.events: List[Dict[str, Any]] = []
         self.status: str = "started"
     
     def end(self, status: str = "completed"):
         """End the span"""
-        self.end_time = time.time()
+        self.end_ns = time.perf_counter_ns()
         self.status = status
     
     def add_attribute(self, key: str, value: Any):
@@ -34,15 +38,25 @@ class Span:
         """Add event to span"""
         self.events.append({
             "name": name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),  # Rendered as ISO by get_events
             "attributes": attributes or {}
         })
     
+    def get_events(self) -> List[Dict[str, Any]]:
+        """Get span events with ISO 8601 timestamps"""
+        return [
+            {
+                "name": event["name"],
+                "timestamp": datetime.fromtimestamp(event["timestamp_ns"] / 1e9).isoformat(),
+                "attributes": event["attributes"]
+            }
+            for event in self.events
+        ]
+    
     def get_duration(self) -> float:
         """Get span duration in seconds"""
-        if self.end_time is None:
-            return time.time() - self.start_time
-        return self.end_time - self.start_time
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
 
 class Tracer:
     """Distributed tracing for agent system"""
@@ -51,11 +65,22 @@ class Tracer:
         self.service_name = service_name
         self.logger = logging.getLogger("tracer")
         self.current_spans: Dict[str, Span] = {}
+        
+        # Ids are a per-process random prefix plus a counter: unique without
+        # drawing fresh randomness for every span
+        self._id_prefix = secrets.token_hex(4)
+        self._id_seq = itertools.count()
+    
+    def _next_id(self) -> str:
+        """Return a new trace/span id"""
+        return f"{self._id_prefix}{next(self._id_seq):016x}"
     
     def start_span(self, name: str, parent_span_id: str = None, attributes: Dict[str, Any] = None) -> str:
         """Start a new span"""
-        trace_id = str(uuid.uuid4())
-        span_id = str(uuid.uuid4())
+        # Child spans join their parent's trace; root spans start a new one
+        parent = self.current_spans.get(parent_span_id) if parent_span_id else None
+        trace_id = parent.trace_id if parent is not None else self._next_id()
+        span_id = self._next_id()
         
         span = Span(trace_id, span_id, name, parent_span_id)
         
@@ -65,13 +90,13 @@ class Tracer:
         
         self.current_spans[span_id] = span
         
-        self.logger.debug(f"Started span: {name} (id: {span_id})")
+        self.logger.debug("Started span: %s (id: %s)", name, span_id)
         return span_id
     
     def end_span(self, span_id: str, status: str = "completed", attributes: Dict[str, Any] = None):
         """End a span"""
         if span_id not in self.current_spans:
-            self.logger.warning(f"Attempted to end unknown span: {span_id}")
+            self.logger.warning("Attempted to end unknown span: %s", span_id)
             return
         
         span = self.current_spans[span_id]
@@ -136,6 +161,9 @@ class Tracer:
     
     def _log_span(self, span: Span):
         """Log span information"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         span_data = {
             "trace_id": span.trace_id,
             "span_id": span.span_id,
@@ -149,7 +177,7 @@ class Tracer:
             "timestamp": datetime.now().isoformat()
         }
         
-        self.logger.info(f"Span completed: {json.dumps(span_data)}")
+        self.logger.info("Span completed: %s", _dumps(span_data))
     
     def get_trace_tree(self, trace_id: str) -> Dict[str, Any]:
         """Get complete trace tree (simplified implementation)"""
@@ -16,50 +16,82 @@ class LongRunningOperation:
         self.checkpoints: List[Dict[str, Any]] = []
         self.start_time = datetime.now()
         
-    async def execute(self, tasks: List[Callable]) -> Dict[str, Any]:
-        """Execute long-running operation with pause/resume capability"""
+        # Set while the operation may run; cleared by pause()
+        self._run_event = asyncio.Event()
+        self._run_event.set()
+        self._cancel_event = asyncio.Event()
+        
+    async def execute(self, tasks: List[Callable], concurrency: int = 1) -> Dict[str, Any]:
+        """Execute long-running operation with pause/resume capability
+        
+        With concurrency > 1 the tasks are treated as independent and up to
+        that many run at once; results are still keyed by task position.
+        """
         self.state = "running"
-        self.logger.info(f"Starting operation: {self.operation_type}")
+        self.logger.info("Starting operation: %s", self.operation_type)
         
         results = {}
+        completed = 0  # Finished tasks, failed ones included
         
-        for i, task in enumerate(tasks):
-            if self.state == "paused":
+        async def run(i: int, task: Callable) -> bool:
+            """Run one task once the operation is unpaused; False if cancelled"""
+            nonlocal completed
+            if not self._run_event.is_set():
                 self.logger.info("Operation paused, waiting for resume...")
-                while self.state == "paused":
-                    await asyncio.sleep(1)
+                await self._wait_or_cancel(self._run_event.wait())
             
             if self.state == "cancelled":
                 self.logger.info("Operation cancelled")
-                break
+                return False
             
             try:
-                # Execute task
-                result = await task()
+                # Execute task, abandoning it if the operation is cancelled meanwhile
+                result = await self._wait_or_cancel(task())
+                if self.state == "cancelled":
+                    self.logger.info("Operation cancelled")
+                    return False
                 results[f"task_{i}"] = result
                 
                 # Update progress
-                self.progress = (i + 1) / len(tasks)
+                completed += 1
+                self.progress = completed / len(tasks)
                 
                 # Create checkpoint
                 await self._create_checkpoint(f"task_{i}_completed", result)
                 
-                self.logger.debug(f"Completed task {i+1}/{len(tasks)}")
+                self.logger.debug("Completed task %d/%d", completed, len(tasks))
                 
             except Exception as e:
-                self.logger.error(f"Task {i} failed: {str(e)}")
+                completed += 1
+                self.logger.error("Task %d failed: %s", i, e)
                 results[f"task_{i}"] = {"error": str(e)}
+            return True
+        
+        if concurrency <= 1:
+            for i, task in enumerate(tasks):
+                if not await run(i, task):
+                    break
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+            
+            async def run_bounded(i: int, task: Callable) -> bool:
+                async with semaphore:
+                    return await run(i, task)
+            
+            await asyncio.gather(*(run_bounded(i, task) for i, task in enumerate(tasks)))
+            results = {f"task_{i}": results[f"task_{i}"] for i in range(len(tasks)) if f"task_{i}" in results}
         
         self.state = "completed"
         self.progress = 1.0
         
-        self.logger.info(f"Operation completed: {self.operation_type}")
+        self.logger.info("Operation completed: %s", self.operation_type)
         return results
     
     async def pause(self) -> bool:
         """Pause the operation"""
         if self.state == "running":
             self.state = "paused"
+            self._run_event.clear()
             await self._create_checkpoint("paused", {})
             self.logger.info("Operation paused")
             return True
@@ -69,6 +101,7 @@ class LongRunningOperation:
         """Resume the operation"""
         if self.state == "paused":
             self.state = "running"
+            self._run_event.set()
             await self._create_checkpoint("resumed", {})
             self.logger.info("Operation resumed")
             return True
@@ -77,9 +110,24 @@ class LongRunningOperation:
     async def cancel(self) -> bool:
         """Cancel the operation"""
         self.state = "cancelled"
+        self._cancel_event.set()
         self.logger.info("Operation cancelled")
         return True
     
+    async def _wait_or_cancel(self, awaitable) -> Any:
+        """Await awaitable unless cancel() is called first (then return None)"""
+        work = asyncio.ensure_future(awaitable)
+        cancelled = asyncio.ensure_future(self._cancel_event.wait())
+        try:
+            await asyncio.wait((work, cancelled), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancelled.cancel()
+            if not work.done():
+                work.cancel()
+                await asyncio.gather(work, return_exceptions=True)
+        
+        return work.result() if not work.cancelled() else None
+    
     async def _create_checkpoint(self, checkpoint_type: str, data: Dict[str, Any]) -> None:
         """Create operation checkpoint"""
         checkpoint = {
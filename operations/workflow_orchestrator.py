@@ -1,9 +1,21 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 import asyncio
 import logging
+import heapq
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 
+# Cached step results kept at most (least recently used evicted first)
+_RESULT_CACHE_SIZE = 1024
+
+# Research is reusable across sessions for much longer than creative output
+_RESEARCH_CACHE_TTL = 24 * 3600
+
 class WorkflowStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -16,36 +28,77 @@ class WorkflowStep:
     """Represents a single step in the workflow"""
     
     def __init__(self, step_id: str, agent_name: str, task: Dict[str, Any], 
-                 dependencies: List[str] = None):
+                 dependencies: List[str] = None, cacheable: bool = True,
+                 cache_scope: str = "session", cache_ttl: Optional[float] = None):
         self.step_id = step_id
         self.agent_name = agent_name
         self.task = task
         self.dependencies = dependencies or []
+        self.cacheable = cacheable
+        self.cache_scope = cache_scope  # "session" or "global" (shared and persisted)
+        self.cache_ttl = cache_ttl  # None uses the orchestrator default
         self.status = WorkflowStatus.PENDING
         self.result: Optional[Dict[str, Any]] = None
         self.error: Optional[str] = None
         self.started_at: Optional[datetime] = None
         self.completed_at: Optional[datetime] = None
+        
+        # Status polls only read these; formatted once when the time is recorded
+        self.started_at_iso: Optional[str] = None
+        self.completed_at_iso: Optional[str] = None
+        self.details_template = {"agent": agent_name}
+    
+    def mark_started(self):
+        self.started_at = datetime.now()
+        self.started_at_iso = self.started_at.isoformat()
+    
+    def mark_completed(self):
+        self.completed_at = datetime.now()
+        self.completed_at_iso = self.completed_at.isoformat()
 
 class WorkflowOrchestrator:
     """Orchestrate complex multi-agent workflows"""
     
-    def __init__(self, session_manager, a2a_protocol):
+    def __init__(self, session_manager, a2a_protocol, max_parallel: int = 8,
+                 cache_ttl: float = 3600, cache_disabled_agents: Iterable[str] = (),
+                 cache_dir: Optional[str] = None, fail_fast: bool = True):
         self.logger = logging.getLogger("workflow_orchestrator")
         self.session_manager = session_manager
         self.a2a_protocol = a2a_protocol
+        self.max_parallel = max_parallel  # Steps in flight at once per workflow
+        self.fail_fast = fail_fast  # Stop a workflow's other steps once one fails
+        
+        # Agent results keyed by a hash of (agent, task, dependency results);
+        # global-scope entries are also persisted under cache_dir, if one is given
+        self.cache_ttl = cache_ttl
+        self.cache_disabled_agents = frozenset(cache_disabled_agents)
+        self.cache_dir = cache_dir
+        self._result_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        
+        # Globally cached steps left to finish after their workflow failed
+        self._background_steps: Set[asyncio.Task] = set()
         self.active_workflows: Dict[str, Dict[str, Any]] = {}
         
     async def create_video_production_workflow(self, session_id: str, topic: str) -> str:
         """Create a video production workflow"""
         workflow_id = f"workflow_{session_id}"
+        steps = self._create_production_steps(topic)
+        dependents, _ = self._build_dependency_graph(steps)
+        priorities = self._rank_by_descendants(steps, dependents)
         
         workflow = {
             "workflow_id": workflow_id,
             "session_id": session_id,
             "topic": topic,
             "status": WorkflowStatus.PENDING,
-            "steps": self._create_production_steps(topic),
+            "steps": steps,
+            "dependents": dependents,
+            "priorities": priorities,
+            # Completed steps, kept so a resumed run only executes what is left
+            "executed_steps": set(),
+            "failed_steps": set(),
+            "executing": False,
+            "cancel_event": asyncio.Event(),
             "created_at": datetime.now().isoformat(),
             "current_step": None,
             "results": {}
@@ -62,17 +115,23 @@ class WorkflowOrchestrator:
             "research_trends": WorkflowStep(
                 step_id="research_trends",
                 agent_name="researcher_trends",
-                task={"topic": topic, "research_type": "trends"}
+                task={"topic": topic, "research_type": "trends"},
+                cache_scope="global",
+                cache_ttl=_RESEARCH_CACHE_TTL
             ),
             "research_facts": WorkflowStep(
                 step_id="research_facts", 
                 agent_name="researcher_facts",
-                task={"topic": topic, "research_type": "facts"}
+                task={"topic": topic, "research_type": "facts"},
+                cache_scope="global",
+                cache_ttl=_RESEARCH_CACHE_TTL
             ),
             "research_competition": WorkflowStep(
                 step_id="research_competition",
                 agent_name="researcher_competition", 
-                task={"topic": topic, "research_type": "competition"}
+                task={"topic": topic, "research_type": "competition"},
+                cache_scope="global",
+                cache_ttl=_RESEARCH_CACHE_TTL
             ),
             "script_writing": WorkflowStep(
                 step_id="script_writing",
@@ -96,7 +155,8 @@ class WorkflowOrchestrator:
                 step_id="thumbnail_creation",
                 agent_name="thumbnail_generator",
                 task={},
-                dependencies=["script_writing"]
+                dependencies=["script_writing"],
+                cacheable=False
             ),
             "quality_validation": WorkflowStep(
                 step_id="quality_validation", 
@@ -114,6 +174,36 @@ class WorkflowOrchestrator:
         
         return steps
     
+    def _build_dependency_graph(self, steps: Dict[str, WorkflowStep]) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+        """Map each step to its direct dependents and count its unmet dependencies"""
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in steps}
+        in_degree: Dict[str, int] = {}
+        
+        for step_id, step in steps.items():
+            in_degree[step_id] = len(step.dependencies)
+            for dependency in step.dependencies:
+                dependents.setdefault(dependency, []).append(step_id)
+        
+        return dependents, in_degree
+    
+    def _rank_by_descendants(self, steps: Dict[str, WorkflowStep],
+                             dependents: Dict[str, List[str]]) -> Dict[str, Tuple[int, int]]:
+        """Heap key per step: most downstream steps first (critical-path
+        heuristic), ties broken by definition order"""
+        descendants: Dict[str, set] = {}
+        
+        def collect(step_id: str) -> set:
+            if step_id not in descendants:
+                descendants[step_id] = set()  # Guards against cycles
+                reachable = set()
+                for child_id in dependents.get(step_id, ()):
+                    reachable.add(child_id)
+                    reachable |= collect(child_id)
+                descendants[step_id] = reachable
+            return descendants[step_id]
+        
+        return {step_id: (-len(collect(step_id)), order) for order, step_id in enumerate(steps)}
+    
     async def execute_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Execute the complete workflow"""
         if workflow_id not in self.active_workflows:
@@ -121,53 +211,109 @@ class WorkflowOrchestrator:
         
         workflow = self.active_workflows[workflow_id]
         workflow["status"] = WorkflowStatus.RUNNING
+        workflow["executing"] = True
         
         self.logger.info(f"Starting workflow execution: {workflow_id}")
         
         try:
-            # Execute steps in dependency order
-            executed_steps = set()
-            total_steps = len(workflow["steps"])
+            # Execute steps in dependency order (Kahn's algorithm): a step becomes
+            # ready once its last unmet dependency completes
+            steps = workflow["steps"]
+            dependents = workflow["dependents"]
+            priorities = workflow["priorities"]
+            executed_steps = workflow["executed_steps"]
             
-            while len(executed_steps) < total_steps:
-                # Find ready steps (all dependencies satisfied)
-                ready_steps = [
-                    step for step in workflow["steps"].values()
-                    if (step.step_id not in executed_steps and
-                        all(dep in executed_steps for dep in step.dependencies))
-                ]
-                
-                if not ready_steps:
-                    # Check for circular dependencies or deadlock
-                    pending_steps = [
-                        step_id for step_id in workflow["steps"]
-                        if step_id not in executed_steps
-                    ]
-                    self.logger.warning(f"No ready steps found. Pending: {pending_steps}")
-                    break
-                
-                # Execute ready steps in parallel
-                execution_tasks = []
-                for step in ready_steps:
-                    task = self._execute_workflow_step(workflow_id, step)
-                    execution_tasks.append(task)
-                
-                # Wait for all parallel steps to complete
-                step_results = await asyncio.gather(*execution_tasks, return_exceptions=True)
+            # Unmet dependencies per remaining step; completed ones (from before a
+            # pause) are neither counted nor run again
+            in_degree = {
+                step_id: sum(dependency not in executed_steps for dependency in step.dependencies)
+                for step_id, step in steps.items() if step_id not in executed_steps
+            }
+            
+            # Ready steps, popped highest fan-out first
+            ready = [(priorities[step_id], step_id) for step_id, degree in in_degree.items() if degree == 0]
+            heapq.heapify(ready)
+            
+            # Continuous scheduling: a step is dispatched as soon as it is ready,
+            # without waiting for the rest of its wave, up to max_parallel at once
+            running: Dict[asyncio.Task, WorkflowStep] = {}
+            cancel_event = workflow["cancel_event"]
+            cancel_waiter = asyncio.create_task(cancel_event.wait())
+            aborted = False
+            
+            def dispatch():
+                # Pausing stops new dispatches; steps already in flight still finish
+                while (ready and len(running) < self.max_parallel and not (aborted or cancel_event.is_set())
+                       and workflow["status"] == WorkflowStatus.RUNNING):
+                    step = steps[heapq.heappop(ready)[1]]
+                    running[asyncio.create_task(self._execute_workflow_step(workflow_id, step))] = step
+            
+            try:
+                dispatch()
+                while running and not aborted and not cancel_event.is_set():
+                    done, _ = await asyncio.wait([*running, cancel_waiter], return_when=asyncio.FIRST_COMPLETED)
+                    
+                    # Process results (in dispatch order)
+                    for task in [task for task in running if task in done]:
+                        step = running.pop(task)
+                        if task.cancelled():
+                            step.status = WorkflowStatus.CANCELLED
+                        elif task.exception() is not None:
+                            error = task.exception()
+                            self.logger.error(f"Step {step.step_id} failed: {str(error)}")
+                            step.status = WorkflowStatus.FAILED
+                            step.error = str(error)
+                            workflow["failed_steps"].add(step.step_id)
+                            aborted = aborted or self.fail_fast
+                        else:
+                            step.status = WorkflowStatus.COMPLETED
+                            step.result = task.result()
+                            workflow["results"][step.step_id] = step.result
+                            executed_steps.add(step.step_id)
+                            workflow["failed_steps"].discard(step.step_id)
+                            
+                            # Release dependents whose last dependency this was
+                            for child_id in dependents[step.step_id]:
+                                in_degree[child_id] -= 1
+                                if in_degree[child_id] == 0:
+                                    heapq.heappush(ready, (priorities[child_id], child_id))
+                        
+                        self.logger.info(f"Step {step.step_id} completed with status: {step.status}")
+                    
+                    dispatch()
+            finally:
+                cancel_waiter.cancel()
                 
-                # Process results
-                for step, result in zip(ready_steps, step_results):
-                    if isinstance(result, Exception):
-                        self.logger.error(f"Step {step.step_id} failed: {str(result)}")
-                        step.status = WorkflowStatus.FAILED
-                        step.error = str(result)
+                # Siblings of a failed step are doomed; only steps whose result
+                # other sessions can reuse are left to finish into the cache
+                for task, step in running.items():
+                    if (aborted and not cancel_event.is_set() and step.cache_scope == "global"
+                            and self._is_cacheable(step)):
+                        # Still RUNNING until it finishes; its outcome is recorded then
+                        self._background_steps.add(task)
+                        task.add_done_callback(
+                            lambda task, step=step: self._finish_background_step(workflow, step, task))
                     else:
-                        step.status = WorkflowStatus.COMPLETED
-                        step.result = result
-                        executed_steps.add(step.step_id)
-                        workflow["results"][step.step_id] = result
-                    
-                    self.logger.info(f"Step {step.step_id} completed with status: {step.status}")
+                        step.status = WorkflowStatus.CANCELLED
+                        task.cancel()
+            
+            if cancel_event.is_set():
+                workflow["status"] = WorkflowStatus.CANCELLED
+                self.logger.info(f"Workflow stopped after cancellation: {workflow_id}")
+                return workflow["results"]
+            
+            if workflow["status"] == WorkflowStatus.PAUSED and not aborted:
+                remaining = len(steps) - len(executed_steps)
+                self.logger.info(f"Workflow paused with {remaining} steps remaining: {workflow_id}")
+                return workflow["results"]
+            
+            # Steps never reached: blocked by a failure, a cycle or a missing dependency
+            pending_steps = [
+                step_id for step_id, step in steps.items()
+                if step.status == WorkflowStatus.PENDING
+            ]
+            if pending_steps:
+                self.logger.warning(f"No ready steps found. Pending: {pending_steps}")
             
             # Check if all steps completed successfully
             failed_steps = [
@@ -188,13 +334,43 @@ class WorkflowOrchestrator:
             workflow["status"] = WorkflowStatus.FAILED
             self.logger.error(f"Workflow execution failed: {str(e)}")
             raise
+        finally:
+            workflow["executing"] = False
+    
+    def _finish_background_step(self, workflow: Dict[str, Any], step: WorkflowStep, task: asyncio.Task):
+        """Record the outcome of a step left running after its workflow failed"""
+        self._background_steps.discard(task)
+        if task.cancelled():
+            step.status = WorkflowStatus.CANCELLED
+        elif task.exception() is not None:
+            step.status = WorkflowStatus.FAILED
+            step.error = str(task.exception())
+            workflow["failed_steps"].add(step.step_id)
+            self.logger.debug(f"Background step {step.step_id} failed: {task.exception()}")
+        else:
+            step.status = WorkflowStatus.COMPLETED
+            step.result = task.result()
+            workflow["results"][step.step_id] = step.result
+            workflow["executed_steps"].add(step.step_id)
     
     async def _execute_workflow_step(self, workflow_id: str, step: WorkflowStep) -> Dict[str, Any]:
         """Execute a single workflow step"""
+        if self.active_workflows[workflow_id]["cancel_event"].is_set():
+            raise asyncio.CancelledError()
+        
         self.logger.info(f"Executing step: {step.step_id} with agent: {step.agent_name}")
         
         step.status = WorkflowStatus.RUNNING
-        step.started_at = datetime.now()
+        step.mark_started()
+        
+        cache_key = None
+        if self._is_cacheable(step):
+            cache_key = self._result_cache_key(workflow_id, step)
+            cached = self._cache_lookup(cache_key, step)
+            if cached is not None:
+                self.logger.info(f"Using cached result for step: {step.step_id}")
+                step.mark_completed()
+                return cached
         
         try:
             # Send message to the appropriate agent
@@ -208,17 +384,102 @@ class WorkflowOrchestrator:
             )
             
             if response and response.success:
-                step.completed_at = datetime.now()
+                step.mark_completed()
+                if cache_key is not None:
+                    self._cache_store(cache_key, step, response.content)
                 return response.content
             else:
                 error_msg = response.error_message if response else "No response received"
                 raise Exception(f"Agent execution failed: {error_msg}")
                 
         except Exception as e:
-            step.completed_at = datetime.now()
+            step.mark_completed()
             step.error = str(e)
             raise
     
+    def _is_cacheable(self, step: WorkflowStep) -> bool:
+        """Whether a step's result may be served from or saved to the cache"""
+        return (step.cacheable and self._step_ttl(step) > 0
+                and step.agent_name not in self.cache_disabled_agents)
+    
+    def _step_ttl(self, step: WorkflowStep) -> float:
+        return self.cache_ttl if step.cache_ttl is None else step.cache_ttl
+    
+    def _result_cache_key(self, workflow_id: str, step: WorkflowStep) -> str:
+        """Content hash of everything a step's result depends on"""
+        workflow = self.active_workflows[workflow_id]
+        results = workflow["results"]
+        payload = {
+            "agent": step.agent_name,
+            "task": step.task,
+            "inputs": {dependency: results.get(dependency) for dependency in step.dependencies}
+        }
+        if step.cache_scope != "global":
+            payload["session"] = workflow["session_id"]
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+    
+    def _cache_lookup(self, key: str, step: WorkflowStep) -> Optional[Dict[str, Any]]:
+        """Return a live cached result for key, or None on a miss"""
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._result_cache.move_to_end(key)
+                return dict(cached[1])
+            del self._result_cache[key]
+        
+        if step.cache_scope != "global" or not self.cache_dir:
+            return None
+        
+        # Fall back to results persisted by earlier processes
+        path = self._cache_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        remaining = entry["expires_at"] - time.time()
+        if remaining <= 0:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        
+        self._remember(key, time.monotonic() + remaining, entry["content"])
+        return dict(entry["content"])
+    
+    def _cache_store(self, key: str, step: WorkflowStep, content: Dict[str, Any]):
+        """Save a successful step result under key"""
+        ttl = self._step_ttl(step)
+        self._remember(key, time.monotonic() + ttl, dict(content))
+        
+        if step.cache_scope != "global" or not self.cache_dir:
+            return
+        
+        path = self._cache_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": time.time() + ttl, "content": content}, f)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not persist result for step {step.step_id}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def _remember(self, key: str, expires_at: float, content: Dict[str, Any]):
+        """Insert into the in-memory LRU, evicting the oldest entry when full"""
+        self._result_cache[key] = (expires_at, content)
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
     async def pause_workflow(self, workflow_id: str) -> bool:
         """Pause a running workflow"""
         if workflow_id not in self.active_workflows:
@@ -244,8 +505,10 @@ class WorkflowOrchestrator:
             workflow["status"] = WorkflowStatus.RUNNING
             self.logger.info(f"Workflow resumed: {workflow_id}")
             
-            # Continue execution from where we left off
-            asyncio.create_task(self.execute_workflow(workflow_id))
+            # Continue execution from where we left off; a run still finishing
+            # its in-flight steps simply picks dispatching back up
+            if not workflow["executing"]:
+                workflow["runner"] = asyncio.create_task(self.execute_workflow(workflow_id))
             return True
         
         return False
@@ -257,6 +520,7 @@ class WorkflowOrchestrator:
         
         workflow = self.active_workflows[workflow_id]
         workflow["status"] = WorkflowStatus.CANCELLED
+        workflow["cancel_event"].set()  # Stops in-flight steps and any further dispatch
         
         self.logger.info(f"Workflow cancelled: {workflow_id}")
         return True
@@ -270,10 +534,7 @@ class WorkflowOrchestrator:
         
         # Calculate progress
         total_steps = len(workflow["steps"])
-        completed_steps = sum(
-            1 for step in workflow["steps"].values()
-            if step.status in [WorkflowStatus.COMPLETED, WorkflowStatus.FAILED]
-        )
+        completed_steps = len(workflow["executed_steps"]) + len(workflow["failed_steps"])
         
         progress = (completed_steps / total_steps) * 100 if total_steps > 0 else 0
         
@@ -287,10 +548,10 @@ class WorkflowOrchestrator:
             "created_at": workflow["created_at"],
             "step_details": {
                 step_id: {
+                    **step.details_template,
                     "status": step.status.value,
-                    "agent": step.agent_name,
-                    "started_at": step.started_at.isoformat() if step.started_at else None,
-                    "completed_at": step.completed_at.isoformat() if step.completed_at else None,
+                    "started_at": step.started_at_iso,
+                    "completed_at": step.completed_at_iso,
                     "error": step.error
                 }
                 for step_id, step in workflow["steps"].items()
@@ -1,50 +1,126 @@
 import json
-import uuid
+import time
+import secrets
+import itertools
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple, Union
 import logging
 import asyncio
-from pydantic import BaseModel
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 
-class AgentMessage(BaseModel):
+# Try to import orjson for faster JSON encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Message ids only need to be unique within this process's protocol traffic
+_PROC_PREFIX = secrets.token_hex(4)
+_MSG_SEQ = itertools.count()
+
+# How often abandoned pending responses are swept, in seconds
+_SWEEP_INTERVAL = 60
+
+def _next_message_id() -> str:
+    """Return a new message/response id"""
+    return f"{_PROC_PREFIX}-{next(_MSG_SEQ):x}"
+
+def _iso(timestamp_ns: int) -> str:
+    """Render a timestamp recorded on the hot path as ISO 8601"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+def _json_default(value: Any) -> Any:
+    # NumPy arrays and scalars become lists/numbers; anything else its str()
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+def _dumps(obj: Any) -> bytes:
+    """Encode obj (dataclasses included) as compact JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    if hasattr(obj, "__dataclass_fields__"):
+        obj = asdict(obj)
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+def _loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Messages are built by trusted in-process code on every hop, so they are plain
+# slotted dataclasses rather than validated models
+
+@dataclass(slots=True)
+class AgentMessage:
     """Standardized message format for Agent-to-Agent communication"""
     message_id: str
     sender: str
     receiver: str
     message_type: str
     content: Dict[str, Any]
-    timestamp: str
+    timestamp_ns: int = field(default_factory=time.time_ns)
     priority: str = "normal"
     response_to: Optional[str] = None
-    metadata: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def timestamp(self) -> str:
+        # Formatted only when read
+        return _iso(self.timestamp_ns)
 
-class MessageResponse(BaseModel):
+@dataclass(slots=True)
+class MessageResponse:
     """Response to an agent message"""
     response_id: str
     original_message_id: str
     sender: str
     content: Dict[str, Any]
     success: bool
-    timestamp: str
+    timestamp_ns: int = field(default_factory=time.time_ns)
     error_message: Optional[str] = None
+    
+    @property
+    def timestamp(self) -> str:
+        return _iso(self.timestamp_ns)
 
 class A2AProtocol:
     """Agent-to-Agent communication protocol"""
     
-    def __init__(self, message_broker_url: str = None):
+    def __init__(self, message_broker_url: str = None, max_pending: int = 10_000):
         self.logger = logging.getLogger("a2a_protocol")
         self.registered_agents: Dict[str, Callable] = {}
         self.message_queue: asyncio.Queue = asyncio.Queue()
-        self.pending_responses: Dict[str, asyncio.Future] = {}
+        
+        # Awaited responses as (future, monotonic deadline), oldest first; capped
+        # at max_pending and swept in case an awaiter never cleans up its entry
+        self.max_pending = max_pending
+        self.pending_responses: "OrderedDict[str, Tuple[asyncio.Future, float]]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
         
         # In production, this would connect to Redis/RabbitMQ
         # self.broker = MessageBroker(message_broker_url)
+        self.message_broker_url = message_broker_url
+        
+        # Direct delivery to in-process handlers: one lock per receiver keeps
+        # its messages in send order, and tasks are held until they finish
+        self._agent_locks: Dict[str, asyncio.Lock] = {}
+        self._dispatch_tasks: Set[asyncio.Task] = set()
     
     def register_agent(self, agent_name: str, message_handler: Callable):
         """Register an agent to receive messages"""
         self.registered_agents[agent_name] = message_handler
         self.logger.info(f"Registered agent: {agent_name}")
     
+    def encode_message(self, message: Union[AgentMessage, MessageResponse]) -> bytes:
+        """Serialize a message or response for delivery through an external broker"""
+        return _dumps(message)
+    
+    def decode_message(self, data: Union[bytes, str]) -> AgentMessage:
+        """Rebuild a message received from an external broker"""
+        return AgentMessage(**_loads(data))
+    
+    def decode_response(self, data: Union[bytes, str]) -> MessageResponse:
+        """Rebuild a response received from an external broker"""
+        return MessageResponse(**_loads(data))
+    
     async def send_message(self, sender: str, receiver: str, 
                          message_type: str, content: Dict[str, Any],
                          priority: str = "normal", 
@@ -52,12 +128,11 @@ class A2AProtocol:
                          timeout: int = 30) -> Optional[MessageResponse]:
         """Send message to another agent"""
         message = AgentMessage(
-            message_id=str(uuid.uuid4()),
+            message_id=_next_message_id(),
             sender=sender,
             receiver=receiver,
             message_type=message_type,
             content=content,
-            timestamp=datetime.now().isoformat(),
             priority=priority
         )
         
@@ -66,60 +141,138 @@ class A2AProtocol:
         if wait_for_response:
             return await self._send_and_await_response(message, timeout)
         else:
-            await self._queue_message(message)
+            await self._deliver(message)
             return None
     
     async def broadcast_message(self, sender: str, message_type: str, 
                               content: Dict[str, Any], 
                               target_agents: List[str] = None):
         """Broadcast message to multiple agents"""
-        receivers = target_agents or list(self.registered_agents.keys())
+        receivers = [receiver for receiver in target_agents or self.registered_agents
+                     if receiver != sender]  # Don't send to self
         
-        for receiver in receivers:
-            if receiver != sender:  # Don't send to self
-                await self.send_message(sender, receiver, message_type, content)
+        results = await asyncio.gather(
+            *(self.send_message(sender, receiver, message_type, content) for receiver in receivers),
+            return_exceptions=True
+        )
+        for receiver, result in zip(receivers, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Broadcast to {receiver} failed: {str(result)}")
         
         self.logger.info(f"Broadcast message from {sender} to {len(receivers)} agents: {message_type}")
     
     async def _send_and_await_response(self, message: AgentMessage, timeout: int) -> MessageResponse:
         """Send message and wait for response"""
-        response_future = asyncio.Future()
-        self.pending_responses[message.message_id] = response_future
+        if len(self.pending_responses) >= self.max_pending:
+            self.logger.warning(f"Rejecting message {message.message_id}: {self.max_pending} responses pending")
+            return self._failure_response(message, "Too many pending responses")
+        
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_pending_responses())
+        
+        response_future = asyncio.get_running_loop().create_future()
+        self.pending_responses[message.message_id] = (response_future, time.monotonic() + timeout)
         
-        await self._queue_message(message)
+        await self._deliver(message)
         
         try:
             response = await asyncio.wait_for(response_future, timeout=timeout)
             return response
         except asyncio.TimeoutError:
             self.logger.warning(f"Timeout waiting for response to message {message.message_id}")
-            return MessageResponse(
-                response_id=str(uuid.uuid4()),
-                original_message_id=message.message_id,
-                sender="system",
-                content={},
-                success=False,
-                timestamp=datetime.now().isoformat(),
-                error_message="Response timeout"
-            )
+            return self._failure_response(message, "Response timeout")
         finally:
             self.pending_responses.pop(message.message_id, None)
     
+    async def _sweep_pending_responses(self):
+        """Periodically resolve pending responses whose deadline has passed"""
+        while self.pending_responses:
+            await asyncio.sleep(_SWEEP_INTERVAL)
+            now = time.monotonic()
+            expired = [message_id for message_id, (_, deadline) in self.pending_responses.items()
+                       if deadline < now]
+            for message_id in expired:
+                # An awaiter may still be waiting (e.g. event-loop lag), so it
+                # gets the same timeout response as its own wait_for would give
+                future, _ = self.pending_responses.pop(message_id)
+                if not future.done():
+                    future.set_result(MessageResponse(
+                        response_id=_next_message_id(),
+                        original_message_id=message_id,
+                        sender="system",
+                        content={},
+                        success=False,
+                        error_message="Response timeout"
+                    ))
+            if expired:
+                self.logger.debug(f"Swept {len(expired)} expired pending responses")
+    
+    def _resolve(self, message_id: str, response: MessageResponse):
+        """Complete the awaiter for message_id, if one is still waiting"""
+        entry = self.pending_responses.pop(message_id, None)
+        if entry is not None and not entry[0].done():
+            entry[0].set_result(response)
+    
+    def _failure_response(self, message: AgentMessage, error: str) -> MessageResponse:
+        return MessageResponse(
+            response_id=_next_message_id(),
+            original_message_id=message.message_id,
+            sender="system",
+            content={},
+            success=False,
+            error_message=error
+        )
+    
+    async def _deliver(self, message: AgentMessage):
+        """Hand message to its receiver, skipping the queue for in-process handlers"""
+        if self.message_broker_url is not None or message.receiver not in self.registered_agents:
+            await self._queue_message(message)
+            return
+        
+        task = asyncio.create_task(self._process_in_order(message))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+    
+    async def _process_in_order(self, message: AgentMessage):
+        """Process message after any earlier messages for the same receiver"""
+        lock = self._agent_locks.get(message.receiver)
+        if lock is None:
+            lock = self._agent_locks[message.receiver] = asyncio.Lock()
+        
+        async with lock:
+            await self._process_message(message)
+    
     async def _queue_message(self, message: AgentMessage):
         """Queue message for processing"""
-        await self.message_queue.put(message)
+        # The queue stands in for the broker, so broker traffic is queued in
+        # its wire form and decoded by the consuming worker
+        if self.message_broker_url is not None:
+            await self.message_queue.put(self.encode_message(message))
+        else:
+            await self.message_queue.put(message)
     
-    async def start_message_processor(self):
-        """Start processing messages from the queue"""
-        self.logger.info("Starting A2A message processor")
+    async def start_message_processor(self, num_workers: int = 8, batch_size: int = 1):
+        """Start processing messages from the queue with num_workers concurrent consumers"""
+        self.logger.info(f"Starting A2A message processor ({num_workers} workers)")
         
+        await asyncio.gather(*(self._worker_loop(batch_size) for _ in range(num_workers)))
+    
+    async def _worker_loop(self, batch_size: int):
+        """Consume queued messages, taking up to batch_size already waiting at a time"""
         while True:
-            try:
-                message = await self.message_queue.get()
-                await self._process_message(message)
-                self.message_queue.task_done()
-            except Exception as e:
-                self.logger.error(f"Error processing message: {str(e)}")
+            batch = [await self.message_queue.get()]
+            while len(batch) < batch_size and not self.message_queue.empty():
+                batch.append(self.message_queue.get_nowait())
+            
+            for message in batch:
+                try:
+                    if isinstance(message, bytes):
+                        message = self.decode_message(message)
+                    await self._process_in_order(message)
+                except Exception as e:
+                    self.logger.error(f"Error processing message: {str(e)}")
+                finally:
+                    self.message_queue.task_done()
     
     async def _process_message(self, message: AgentMessage):
         """Process a single message"""
@@ -140,16 +293,13 @@ class A2AProtocol:
             # Send response if requested
             if message.message_id in self.pending_responses:
                 response = MessageResponse(
-                    response_id=str(uuid.uuid4()),
+                    response_id=_next_message_id(),
                     original_message_id=message.message_id,
                     sender=message.receiver,
                     content=response_content,
-                    success=True,
-                    timestamp=datetime.now().isoformat()
+                    success=True
                 )
-                
-                future = self.pending_responses[message.message_id]
-                future.set_result(response)
+                self._resolve(message.message_id, response)
             
             self.logger.debug(f"Processed message {message.message_id} for {message.receiver}")
             
@@ -160,18 +310,19 @@ class A2AProtocol:
     async def _send_error_response(self, message: AgentMessage, error: str):
         """Send error response for failed message processing"""
         if message.message_id in self.pending_responses:
-            response = MessageResponse(
-                response_id=str(uuid.uuid4()),
-                original_message_id=message.message_id,
-                sender="system",
-                content={},
-                success=False,
-                timestamp=datetime.now().isoformat(),
-                error_message=error
-            )
-            
-            future = self.pending_responses[message.message_id]
-            future.set_result(response)
+            self._resolve(message.message_id, self._failure_response(message, error))
+
+# Fixed parts of the templates below, built once; list-valued fields are
+# tuples so the shared values cannot be mutated through a returned message
+_RESEARCH_REQUIREMENTS = {
+    "depth": "comprehensive",
+    "sources": ("academic", "news", "trends")
+}
+_REVIEW_ASPECTS = ("clarity", "engagement", "accuracy", "structure")
+_QUALITY_STANDARDS = {
+    "min_score": 0.7,
+    "required_components": ("script", "audio", "visuals")
+}
 
 class MessageTemplates:
     """Pre-defined message templates for common agent communications"""
@@ -183,10 +334,7 @@ class MessageTemplates:
             "action": "research",
             "topic": topic,
             "research_type": research_type,
-            "requirements": {
-                "depth": "comprehensive",
-                "sources": ["academic", "news", "trends"]
-            }
+            "requirements": dict(_RESEARCH_REQUIREMENTS)
         }
     
     @staticmethod
@@ -195,7 +343,7 @@ class MessageTemplates:
         return {
             "action": "review_script",
             "script_data": script_data,
-            "review_aspects": ["clarity", "engagement", "accuracy", "structure"]
+            "review_aspects": _REVIEW_ASPECTS
         }
     
     @staticmethod
@@ -204,10 +352,7 @@ class MessageTemplates:
         return {
             "action": "validate_quality",
             "assets": assets,
-            "quality_standards": {
-                "min_score": 0.7,
-                "required_components": ["script", "audio", "visuals"]
-            }
+            "quality_standards": dict(_QUALITY_STANDARDS)
         }
     
     @staticmethod
@@ -0,0 +1,116 @@
+import asyncio
+
+import protocols.a2a_protocol as a2a_protocol
+from protocols import A2AProtocol, AgentMessage
+
+
+def test_direct_delivery_keeps_each_receivers_messages_in_order():
+    async def main():
+        protocol = A2AProtocol()
+        received = []
+        
+        async def handler(message):
+            await asyncio.sleep(0.01 if message.content["i"] == 0 else 0)
+            received.append(message.content["i"])
+            return {"i": message.content["i"]}
+        
+        protocol.register_agent("agent", handler)
+        responses = await asyncio.gather(*(
+            protocol.send_message("sender", "agent", "task", {"i": i}, wait_for_response=True) for i in range(3)
+        ))
+        return received, responses
+    
+    received, responses = asyncio.run(main())
+    
+    assert received == [0, 1, 2]
+    assert [response.content for response in responses] == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+def test_broker_messages_round_trip_through_the_queue_encoded():
+    async def main():
+        protocol = A2AProtocol(message_broker_url="broker://test")
+        protocol.register_agent("agent", lambda message: {"echo": message.content["value"]})
+        processor = asyncio.create_task(protocol.start_message_processor(num_workers=2))
+        
+        sending = asyncio.create_task(protocol.send_message(
+            "sender", "agent", "task", {"value": 42}, wait_for_response=True))
+        await asyncio.sleep(0)
+        queued = protocol.message_queue._queue[0] if protocol.message_queue.qsize() else None
+        
+        response = await sending
+        processor.cancel()
+        return queued, response
+    
+    queued, response = asyncio.run(main())
+    
+    assert isinstance(queued, bytes)
+    assert response.success and response.content == {"echo": 42}
+
+
+def test_unknown_receiver_and_handler_errors_return_failed_responses():
+    async def main():
+        protocol = A2AProtocol()
+        
+        def failing(message):
+            raise RuntimeError("boom")
+        
+        protocol.register_agent("failing", failing)
+        processor = asyncio.create_task(protocol.start_message_processor())
+        unknown = await protocol.send_message("sender", "nobody", "task", {}, wait_for_response=True)
+        failed = await protocol.send_message("sender", "failing", "task", {}, wait_for_response=True)
+        processor.cancel()
+        return unknown, failed, protocol.pending_responses
+    
+    unknown, failed, pending = asyncio.run(main())
+    
+    assert not unknown.success and unknown.error_message == "Unknown agent: nobody"
+    assert not failed.success and failed.error_message == "boom"
+    assert not pending
+
+
+def test_sends_beyond_max_pending_are_rejected():
+    async def main():
+        protocol = A2AProtocol(max_pending=1)
+        
+        async def slow(message):
+            await asyncio.sleep(0.05)
+            return {}
+        
+        protocol.register_agent("agent", slow)
+        return await asyncio.gather(*(
+            protocol.send_message("sender", "agent", "task", {}, wait_for_response=True) for _ in range(2)
+        ))
+    
+    first, second = asyncio.run(main())
+    
+    assert first.success
+    assert not second.success and second.error_message == "Too many pending responses"
+
+
+def test_sweeper_resolves_expired_responses_with_a_timeout(monkeypatch):
+    monkeypatch.setattr(a2a_protocol, "_SWEEP_INTERVAL", 0.01)
+    
+    async def main():
+        protocol = A2AProtocol()
+        future = asyncio.get_running_loop().create_future()
+        protocol.pending_responses["message"] = (future, 0)
+        protocol._sweeper = asyncio.create_task(protocol._sweep_pending_responses())
+        return await future, protocol.pending_responses
+    
+    response, pending = asyncio.run(main())
+    
+    assert not response.success and response.error_message == "Response timeout"
+    assert response.original_message_id == "message"
+    assert not pending
+
+
+def test_encode_decode_round_trip():
+    protocol = A2AProtocol()
+    message = AgentMessage(message_id="m", sender="a", receiver="b", message_type="t",
+                           content={"values": (1, 2)}, metadata={"k": "v"})
+    
+    decoded = protocol.decode_message(protocol.encode_message(message))
+    
+    assert decoded.content == {"values": [1, 2]}
+    assert decoded.timestamp_ns == message.timestamp_ns
+    assert decoded.timestamp == message.timestamp
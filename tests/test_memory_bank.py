@@ -0,0 +1,106 @@
+from memory.memory_bank import MemoryBank
+
+
+def test_eviction_bounds_the_whole_bank_at_max_items():
+    bank = MemoryBank(max_items=10)
+    for i in range(200):
+        bank.store("k", {"i": i})
+    
+    assert len(bank.memories) == 10
+    assert bank.get_stats()["total_memories"] == 10
+    assert sorted(memory.content["i"] for memory in bank.memories.values()) == list(range(190, 200))
+
+
+def test_eviction_removes_the_least_recently_used_memory():
+    bank = MemoryBank(max_items=3)
+    first = bank.store("k", {"i": 0})
+    second = bank.store("k", {"i": 1})
+    bank.store("k", {"i": 2})
+    
+    bank.retrieve(first)  # Now more recent than the second memory
+    bank.store("k", {"i": 3})
+    
+    assert bank.retrieve(first) is not None
+    assert bank.retrieve(second) is None
+
+
+def test_evicted_memories_leave_the_indexes():
+    bank = MemoryBank(max_items=2)
+    for i in range(5):
+        bank.store("k", {"i": i}, {"session_id": "s1", "type": "fact"})
+    
+    assert len(bank.get_session_memories("s1")) == 2
+    assert bank.get_stats()["memory_types"] == {"fact": 2}
+    assert len(bank.semantic_search("i", limit=10)) == 2
+
+
+def test_session_and_type_indexes():
+    bank = MemoryBank()
+    bank.store("k", {"finding": "a"}, {"session_id": "s1", "type": "research"})
+    bank.store("k", {"decision": "b"}, {"session_id": "s1", "type": "decision"})
+    bank.store("k", {"finding": "c"}, {"session_id": "s2", "type": "research"})
+    
+    assert {memory.content["finding"] for memory in bank.get_session_memories("s2")} == {"c"}
+    assert len(bank.get_memories_by_types(["research"])) == 2
+    assert [memory.content for memory in bank.get_memories_by_types(["research"], session_id="s1")] == [{"finding": "a"}]
+    assert [memory.content for memory in bank.search({"metadata.session_id": "s1", "decision": "b"})] == [{"decision": "b"}]
+
+
+def test_update_reindexes_metadata():
+    bank = MemoryBank()
+    memory_id = bank.store("k", {"x": 1}, {"session_id": "s1", "type": "fact"})
+    
+    assert bank.update(memory_id, {"metadata": {"type": "decision"}, "content": {"y": 2}})
+    
+    assert bank.get_memories_by_types(["fact"]) == []
+    assert bank.get_memories_by_types(["decision"])[0].content == {"x": 1, "y": 2}
+
+
+def test_deleted_memories_are_not_returned_by_any_lookup():
+    bank = MemoryBank()
+    kept = bank.store("k", {"text": "alpha beta"}, {"session_id": "s1", "type": "fact"})
+    deleted = bank.store("k", {"text": "alpha gamma"}, {"session_id": "s1", "type": "fact"})
+    bank.flush_embeds()
+    
+    assert bank.delete(deleted)
+    assert not bank.delete(deleted)
+    
+    assert [memory.id for memory in bank.semantic_search("alpha", limit=5)] == [kept]
+    assert [memory.id for memory in bank.get_session_memories("s1")] == [kept]
+    assert bank.get_stats()["total_memories"] == 1
+
+
+def test_stats_track_accesses():
+    bank = MemoryBank()
+    memory_id = bank.store("k", {"x": 1})
+    bank.retrieve(memory_id)
+    bank.retrieve(memory_id)
+    
+    stats = bank.get_stats()
+    assert stats["total_memories"] == 1
+    assert stats["total_accesses"] == 2
+
+
+def test_none_queries_match_memories_without_the_key():
+    bank = MemoryBank()
+    untyped = bank.store("k", {"x": 1})
+    bank.store("k", {"x": 2}, {"session_id": "s1", "type": "fact"})
+    
+    assert [memory.id for memory in bank.search({"metadata.type": None})] == [untyped]
+    assert [memory.id for memory in bank.search({"metadata.session_id": None})] == [untyped]
+    assert [memory.id for memory in bank.get_session_memories(None)] == [untyped]
+
+
+def test_unhashable_metadata_values_are_stored_and_searchable():
+    bank = MemoryBank()
+    memory_id = bank.store("k", {"x": 1}, {"session_id": ["s1", "s2"], "type": ["fact"]})
+    bank.store("k", {"x": 2}, {"session_id": "s1", "type": "fact"})
+    
+    assert [memory.id for memory in bank.search({"metadata.session_id": ["s1", "s2"]})] == [memory_id]
+    assert [memory.id for memory in bank.search({"metadata.type": ["fact"]})] == [memory_id]
+    assert [memory.id for memory in bank.get_session_memories(["s1", "s2"])] == [memory_id]
+    
+    assert bank.update(memory_id, {"metadata": {"type": "decision"}})
+    assert [memory.id for memory in bank.get_memories_by_types(["decision"])] == [memory_id]
+    assert bank.delete(memory_id)
+    assert bank.get_stats()["total_memories"] == 1
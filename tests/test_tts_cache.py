@@ -0,0 +1,67 @@
+import asyncio
+import os
+
+from memory.tts_cache import TTSCache
+
+
+def write_audio(path, size):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return str(path)
+
+
+def test_put_then_get_returns_the_cached_copy(tmp_path):
+    cache = TTSCache(cache_dir=str(tmp_path / "cache"))
+    source = write_audio(tmp_path / "source.mp3", 10)
+    
+    assert cache.get("hello", "voice") is None
+    cached = cache.put("hello", "voice", source)
+    
+    assert cached == cache.get("hello", "voice")
+    assert cache.get("hello", "other voice") is None
+
+
+def test_eviction_keeps_the_cache_under_max_bytes_dropping_least_used(tmp_path):
+    cache = TTSCache(cache_dir=str(tmp_path / "cache"), max_bytes=250)
+    source = write_audio(tmp_path / "source.mp3", 100)
+    
+    cache.put("popular", "voice", source)
+    cache.get("popular", "voice")
+    cache.put("rare", "voice", source)
+    cache.put("new", "voice", source)
+    
+    assert cache.get("popular", "voice") is not None
+    assert cache.get("rare", "voice") is None
+    assert cache._total_bytes == 200
+
+
+def test_directory_is_scanned_only_when_over_budget(tmp_path, monkeypatch):
+    cache = TTSCache(cache_dir=str(tmp_path / "cache"), max_bytes=10_000)
+    source = write_audio(tmp_path / "source.mp3", 100)
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+    
+    for text in ("a", "b", "c", "d"):
+        cache.put(text, "voice", source)
+    
+    assert len(scans) == 1  # The initial size scan only
+    assert cache._total_bytes == 400
+
+
+def test_get_or_synth_only_synthesizes_misses(tmp_path):
+    cache = TTSCache(cache_dir=str(tmp_path / "cache"))
+    synthesized = []
+    
+    async def synthesize(text):
+        synthesized.append(text)
+        return write_audio(tmp_path / f"{text}.mp3", 10)
+    
+    async def main():
+        await cache.get_or_synth("hello", "voice", synthesize)
+        return await cache.get_or_synth("hello", "voice", synthesize)
+    
+    path = asyncio.run(main())
+    
+    assert synthesized == ["hello"]
+    assert path == cache.get("hello", "voice")
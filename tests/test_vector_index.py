@@ -0,0 +1,27 @@
+from memory.vector_index import VectorIndex
+
+
+def test_query_ranks_the_closest_text_first():
+    index = VectorIndex()
+    index.add_many([("cats", "cats purr and chase mice"), ("cars", "cars need fuel and tires")])
+    
+    hits = index.query("mice and cats", k=2)
+    
+    assert [key for key, _ in hits] == ["cats", "cars"]
+    assert hits[0][1] > hits[1][1]
+
+
+def test_re_adding_a_key_replaces_it_and_remove_drops_it():
+    index = VectorIndex()
+    index.add("a", "first text")
+    index.add("a", "second text")
+    index.add("b", "other words")
+    assert len(index) == 2
+    
+    assert index.remove("a")
+    assert not index.remove("a")
+    assert [key for key, _ in index.query("second text", k=5)] == ["b"]
+
+
+def test_query_on_an_empty_index():
+    assert VectorIndex().query("anything") == []
@@ -0,0 +1,74 @@
+import asyncio
+import wave
+
+import agents.video_production_team as video_production_team
+from agents.video_production_team import VideoProductionTeam
+
+
+class FakeSlides:
+    """Stands in for AnimatedSlideGenerator, recording fallback renders"""
+    
+    frame_size = (4, 4)
+    
+    def __init__(self):
+        self.fallback_calls = []
+    
+    def iter_frames(self, slides, fps):
+        return iter(())
+    
+    def create_animated_video(self, slides, output_path, fps):
+        self.fallback_calls.append(output_path)
+        return output_path
+
+
+def write_wav(path):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(b"\0\0" * 80)
+    return str(path)
+
+
+def make_team(tmp_path):
+    team = VideoProductionTeam()
+    team.animated_slides = FakeSlides()
+    
+    async def narrate(texts):
+        for idx, _ in enumerate(texts):
+            yield write_wav(tmp_path / f"{idx}.wav")
+    
+    team._narrate = narrate
+    return team
+
+
+def test_ffmpeg_spawn_errors_fall_back_to_the_silent_video(tmp_path, monkeypatch):
+    async def refuse(*args, **kwargs):
+        raise PermissionError("ffmpeg is not executable")
+    
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", refuse)
+    team = make_team(tmp_path)
+    
+    video = asyncio.run(team._assemble_final_video({"script": {"final_script": {"title": "Title"}}}))
+    
+    assert video == "output_videos/output_video.mp4"
+    assert team.animated_slides.fallback_calls == [video]
+
+
+def test_narration_is_passed_as_files_without_posix_pipes(tmp_path, monkeypatch):
+    commands = []
+    
+    async def refuse(*args, **kwargs):
+        commands.append((args, kwargs))
+        raise FileNotFoundError("ffmpeg")
+    
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", refuse)
+    monkeypatch.setattr(video_production_team, "_STREAM_PCM", False)
+    team = make_team(tmp_path)
+    
+    asyncio.run(team._assemble_final_video({"script": {"final_script": {"title": "Title"}}}))
+    
+    (args, kwargs), = commands
+    assert kwargs["pass_fds"] == ()
+    assert str(tmp_path / "0.wav") in args
+    assert not any(arg.startswith("pipe:") and arg != "pipe:0" for arg in args)
@@ -0,0 +1,236 @@
+import asyncio
+
+import operations.workflow_orchestrator as workflow_orchestrator
+from operations import WorkflowOrchestrator, WorkflowStatus
+from protocols import A2AProtocol
+
+AGENTS = {
+    "research_trends": "researcher_trends",
+    "research_facts": "researcher_facts",
+    "research_competition": "researcher_competition",
+    "script_writing": "script_writer",
+    "voiceover_production": "voice_synthesizer",
+    "visual_production": "video_editor",
+    "thumbnail_creation": "thumbnail_generator",
+    "quality_validation": "quality_validator",
+    "final_assembly": "video_assembler",
+}
+
+
+def make_protocol(calls, delays=None, failing=(), events=None):
+    """A2AProtocol whose agents record their calls, sleep, and optionally fail"""
+    protocol = A2AProtocol()
+    delays = delays or {}
+    
+    for agent_name in AGENTS.values():
+        async def handler(message, agent_name=agent_name):
+            if events is not None:
+                events.append(("start", agent_name))
+            await asyncio.sleep(delays.get(agent_name, 0.01))
+            calls.append(agent_name)
+            if events is not None:
+                events.append(("end", agent_name))
+            if agent_name in failing:
+                raise RuntimeError("boom")
+            return {"agent": agent_name, "topic": message.content.get("topic")}
+        protocol.register_agent(agent_name, handler)
+    
+    return protocol
+
+
+def step_statuses(orchestrator, workflow_id):
+    return {step_id: step.status for step_id, step in orchestrator.active_workflows[workflow_id]["steps"].items()}
+
+
+def test_steps_start_only_after_their_dependencies_finish():
+    async def main():
+        calls, events = [], []
+        orchestrator = WorkflowOrchestrator(None, make_protocol(calls, events=events), cache_ttl=0)
+        workflow_id = await orchestrator.create_video_production_workflow("s1", "AI agents")
+        results = await orchestrator.execute_workflow(workflow_id)
+        return orchestrator, workflow_id, results, events
+    
+    orchestrator, workflow_id, results, events = asyncio.run(main())
+    
+    assert set(results) == set(AGENTS)
+    assert orchestrator.get_workflow_status(workflow_id)["status"] == "completed"
+    
+    position = {event: i for i, event in enumerate(events)}
+    for step in orchestrator.active_workflows[workflow_id]["steps"].values():
+        for dependency in step.dependencies:
+            assert position[("end", AGENTS[dependency])] < position[("start", step.agent_name)]
+
+
+def test_independent_steps_run_concurrently():
+    async def main():
+        calls, events = [], []
+        orchestrator = WorkflowOrchestrator(None, make_protocol(calls, events=events), cache_ttl=0)
+        workflow_id = await orchestrator.create_video_production_workflow("s1", "topic")
+        await orchestrator.execute_workflow(workflow_id)
+        return events
+    
+    events = asyncio.run(main())
+    
+    # All three research agents start before any of them finishes
+    first_end = next(i for i, (kind, _) in enumerate(events) if kind == "end")
+    started = {agent for kind, agent in events[:first_end] if kind == "start"}
+    assert {"researcher_trends", "researcher_facts", "researcher_competition"} <= started
+
+
+def test_failure_cancels_running_siblings_and_blocks_dependents():
+    async def main():
+        calls = []
+        protocol = make_protocol(calls, delays={"researcher_trends": 0.2, "researcher_competition": 0.2},
+                                 failing={"researcher_facts"})
+        orchestrator = WorkflowOrchestrator(None, protocol, cache_ttl=0)
+        workflow_id = await orchestrator.create_video_production_workflow("s1", "topic")
+        await orchestrator.execute_workflow(workflow_id)
+        return orchestrator, workflow_id, calls
+    
+    orchestrator, workflow_id, calls = asyncio.run(main())
+    statuses = step_statuses(orchestrator, workflow_id)
+    
+    assert orchestrator.get_workflow_status(workflow_id)["status"] == "failed"
+    assert statuses["research_facts"] == WorkflowStatus.FAILED
+    assert statuses["research_trends"] == WorkflowStatus.CANCELLED
+    assert statuses["research_competition"] == WorkflowStatus.CANCELLED
+    assert statuses["script_writing"] == WorkflowStatus.PENDING
+    assert "script_writer" not in calls
+
+
+def test_cacheable_siblings_finish_in_background_after_failure():
+    async def main():
+        calls = []
+        protocol = make_protocol(calls, delays={"researcher_trends": 0.05, "researcher_competition": 0.05},
+                                 failing={"researcher_facts"})
+        orchestrator = WorkflowOrchestrator(None, protocol)
+        workflow_id = await orchestrator.create_video_production_workflow("s1", "topic")
+        await orchestrator.execute_workflow(workflow_id)
+        running = step_statuses(orchestrator, workflow_id)
+        await asyncio.sleep(0.2)
+        return running, step_statuses(orchestrator, workflow_id), orchestrator
+    
+    running, finished, orchestrator = asyncio.run(main())
+    
+    assert running["research_trends"] == WorkflowStatus.RUNNING
+    assert finished["research_trends"] == WorkflowStatus.COMPLETED
+    assert finished["research_competition"] == WorkflowStatus.COMPLETED
+    assert not orchestrator._background_steps
+
+
+def test_cancel_workflow_stops_in_flight_and_pending_steps():
+    async def main():
+        calls = []
+        orchestrator = WorkflowOrchestrator(None, make_protocol(calls, delays={"researcher_trends": 0.2}),
+                                            cache_ttl=0)
+        workflow_id = await orchestrator.create_video_production_workflow("s1", "topic")
+        execution = asyncio.create_task(orchestrator.execute_workflow(workflow_id))
+        await asyncio.sleep(0.05)
+        await orchestrator.cancel_workflow(workflow_id)
+        await execution
+        return orchestrator, workflow_id, calls
+    
+    orchestrator, workflow_id, calls = asyncio.run(main())
+    statuses = step_statuses(orchestrator, workflow_id)
+    
+    assert orchestrator.get_workflow_status(workflow_id)["status"] == "cancelled"
+    assert statuses["research_trends"] == WorkflowStatus.CANCELLED
+    assert statuses["script_writing"] == WorkflowStatus.PENDING
+    assert "script_writer" not in calls
+
+
+def test_resume_runs_only_the_remaining_steps():
+    async def main():
+        calls = []
+        research_delays = {"researcher_trends": 0.05, "researcher_facts": 0.05, "researcher_competition": 0.05}
+        orchestrator = WorkflowOrchestrator(None, make_protocol(calls, delays=research_delays), cache_ttl=0)
+        workflow_id = await orchestrator.create_video_production_workflow("s1", "topic")
+        
+        execution = asyncio.create_task(orchestrator.execute_workflow(workflow_id))
+        await asyncio.sleep(0.01)  # Research is in flight
+        await orchestrator.pause_workflow(workflow_id)
+        await execution
+        paused_calls = list(calls)
+        paused_status = orchestrator.get_workflow_status(workflow_id)
+        
+        await orchestrator.resume_workflow(workflow_id)
+        await orchestrator.active_workflows[workflow_id]["runner"]
+        return orchestrator, workflow_id, paused_calls, paused_status, calls
+    
+    orchestrator, workflow_id, paused_calls, paused_status, calls = asyncio.run(main())
+    
+    assert paused_status["status"] == "paused"
+    assert sorted(paused_calls) == ["researcher_competition", "researcher_facts", "researcher_trends"]
+    assert paused_status["completed_steps"] == 3
+    
+    assert orchestrator.get_workflow_status(workflow_id)["status"] == "completed"
+    assert sorted(calls) == sorted(AGENTS.values())  # Every agent exactly once
+
+
+def test_result_cache_reuses_results_across_workflows():
+    async def main():
+        calls = []
+        orchestrator = WorkflowOrchestrator(None, make_protocol(calls))
+        
+        first = await orchestrator.create_video_production_workflow("s1", "topic")
+        await orchestrator.execute_workflow(first)
+        first_calls = list(calls)
+        
+        calls.clear()
+        second = await orchestrator.create_video_production_workflow("s2", "topic")
+        results = await orchestrator.execute_workflow(second)
+        return first_calls, calls, results
+    
+    first_calls, second_calls, results = asyncio.run(main())
+    
+    assert sorted(first_calls) == sorted(AGENTS.values())
+    # Research is cached globally; session-scoped and uncacheable steps run again
+    assert not {"researcher_trends", "researcher_facts", "researcher_competition"} & set(second_calls)
+    assert "script_writer" in second_calls
+    assert "thumbnail_generator" in second_calls
+    assert results["research_facts"] == {"agent": "researcher_facts", "topic": "topic"}
+
+
+def test_result_cache_keys_on_task_and_respects_opt_outs():
+    async def main():
+        calls = []
+        orchestrator = WorkflowOrchestrator(None, make_protocol(calls),
+                                            cache_disabled_agents=["researcher_trends"])
+        
+        for session_id, topic in (("s1", "a"), ("s2", "a"), ("s3", "b")):
+            workflow_id = await orchestrator.create_video_production_workflow(session_id, topic)
+            await orchestrator.execute_workflow(workflow_id)
+        return calls
+    
+    calls = asyncio.run(main())
+    
+    assert calls.count("researcher_trends") == 3  # Opted out
+    assert calls.count("researcher_facts") == 2  # Once per distinct topic
+
+
+def test_result_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(workflow_orchestrator.time, "monotonic", lambda: now[0])
+    
+    orchestrator = WorkflowOrchestrator(None, None, cache_ttl=60)
+    step = workflow_orchestrator.WorkflowStep("step", "agent", {"x": 1})
+    
+    orchestrator._cache_store("key", step, {"value": 1})
+    assert orchestrator._cache_lookup("key", step) == {"value": 1}
+    
+    now[0] += 61
+    assert orchestrator._cache_lookup("key", step) is None
+    assert "key" not in orchestrator._result_cache
+
+
+def test_global_results_persist_only_with_a_cache_dir(tmp_path):
+    step = workflow_orchestrator.WorkflowStep("step", "agent", {"x": 1}, cache_scope="global")
+    
+    in_memory = WorkflowOrchestrator(None, None)
+    in_memory._cache_store("key", step, {"value": 1})
+    assert WorkflowOrchestrator(None, None)._cache_lookup("key", step) is None
+    
+    writer = WorkflowOrchestrator(None, None, cache_dir=str(tmp_path))
+    writer._cache_store("key", step, {"value": 1})
+    reader = WorkflowOrchestrator(None, None, cache_dir=str(tmp_path))
+    assert reader._cache_lookup("key", step) == {"value": 1}
@@ -1,6 +1,7 @@
 import os
 import json
-from typing import Dict, Any, List
+import uuid
+from typing import Dict, Any, Iterator, List, Optional
 import logging
 import asyncio
 import numpy as np
@@ -28,12 +29,26 @@ except ImportError:
     play = None
     set_api_key = None
 
+
+def _write_placeholder(path: str, text: str) -> None:
+    """Write a placeholder file in one call (run off the event loop)"""
+    with open(path, "w") as f:
+        f.write(text)
+
+
 class VoiceSynthesisTool:
     """Convert text to speech using offline TTS (no API keys required)"""
     
-    def __init__(self):
+    def __init__(self, max_batch: int = 8):
         self.logger = logging.getLogger("tool.voice_synthesis")
         self.engine = None
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Caps engine jobs in flight however many callers fan out at once;
+        # pyttsx3 engines are not thread-safe, so the shared engine runs one
+        # job at a time unless TTS_CONCURRENCY is raised for a thread-safe backend
+        self._tts_sem = asyncio.Semaphore(int(os.getenv("TTS_CONCURRENCY", "1")))
         self._initialize_engine()
     
     def _initialize_engine(self):
@@ -71,7 +86,7 @@ class VoiceSynthesisTool:
             self.logger.info(f"🔊 Converting text to speech ({len(text)} characters)")
             
             if output_path is None:
-                output_path = f"output_videos/voiceover_{__import__('uuid').uuid4().hex[:8]}.mp3"
+                output_path = self._default_output_path()
             
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
@@ -88,7 +103,8 @@ class VoiceSynthesisTool:
                 time.sleep(len(text) / 150 + 0.5)  # Estimate TTS processing time
                 return output_path
             
-            result = await loop.run_in_executor(None, _synthesize)
+            async with self._tts_sem:
+                result = await loop.run_in_executor(None, _synthesize)
             self.logger.info(f"✓ Speech synthesized: {result}")
             return result
             
@@ -96,6 +112,52 @@ class VoiceSynthesisTool:
             self.logger.error(f"Voice synthesis failed: {str(e)}")
             return ""
     
+    async def synthesize_batch(self, texts: List[str]) -> List[str]:
+        """
+        Synthesize several texts in a single engine pass
+        
+        All segments are queued on the TTS engine at once and processed
+        together instead of paying per-call overhead for each one.
+        
+        Args:
+            texts: List of text strings to convert
+        
+        Returns:
+            Paths to the generated audio files, in input order
+            (empty string for any segment that could not be synthesized)
+        """
+        if not texts:
+            return []
+        
+        if not self.engine:
+            self.logger.warning("TTS engine not available, skipping voice synthesis")
+            return [""] * len(texts)
+        
+        try:
+            self.logger.info(f"🔊 Converting {len(texts)} segments to speech in one batch")
+            
+            output_paths = [self._default_output_path() for _ in texts]
+            os.makedirs("output_videos", exist_ok=True)
+            
+            loop = asyncio.get_event_loop()
+            
+            # Run in executor to avoid blocking the event loop
+            def _synthesize_all():
+                for text, output_path in zip(texts, output_paths):
+                    self.engine.save_to_file(text, output_path)
+                import time
+                time.sleep(sum(len(text) for text in texts) / 150 + 0.5)  # Estimate TTS processing time
+                return output_paths
+            
+            async with self._tts_sem:
+                result = await loop.run_in_executor(None, _synthesize_all)
+            self.logger.info(f"✓ Speech synthesized for {len(result)} segments")
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Batch voice synthesis failed: {str(e)}")
+            return [""] * len(texts)
+    
     async def synthesize_multiple(self, texts: List[str]) -> List[str]:
         """
         Synthesize multiple text segments into separate audio files
@@ -106,14 +168,63 @@ class VoiceSynthesisTool:
         Returns:
             List of paths to generated audio files
         """
-        audio_files = []
-        for idx, text in enumerate(texts):
-            if text.strip():
-                self.logger.info(f"Converting segment {idx + 1}/{len(texts)}")
-                audio_file = await self.synthesize_speech(text)
-                if audio_file:
-                    audio_files.append(audio_file)
-        return audio_files
+        results = await asyncio.gather(*[self.enqueue(text) for text in texts if text.strip()])
+        return [audio_file for audio_file in results if audio_file]
+    
+    async def enqueue(self, text: str) -> str:
+        """
+        Queue text for synthesis and wait for its audio file
+        
+        Queued texts are coalesced into batches by a background worker, so
+        concurrent callers share engine passes.
+        
+        Returns:
+            Path to the generated audio file, or empty string if failed
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        
+        # The worker exits once the queue drains; restart it on demand
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._batch_worker())
+        
+        return await future
+    
+    async def _batch_worker(self):
+        """Drain the synthesis queue in adaptively sized batches"""
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            
+            # An idle queue flushes a single item right away; a backed-up
+            # queue coalesces up to max_batch items into one engine pass.
+            # Queue depth is the only load signal: this worker is the sole
+            # batch submitter and awaits each pass, so an in-flight ratio
+            # against _tts_sem (capacity 1 per engine) would always read idle
+            batch_size = max(1, min(self.max_batch, self._queue.qsize() + 1))
+            while len(batch) < batch_size:
+                batch.append(self._queue.get_nowait())
+            
+            texts = [text for text, _ in batch]
+            self.logger.info(f"Converting batch of {len(texts)} segments ({self._queue.qsize()} waiting)")
+            
+            # synthesize_batch reports failures as "" entries rather than raising
+            audio_files = await self.synthesize_batch(texts)
+            for (_, future), audio_file in zip(batch, audio_files):
+                if not future.done():
+                    future.set_result(audio_file)
+    
+    def cache_voice_key(self) -> str:
+        """Identify the current voice settings for audio caching"""
+        if not self.engine:
+            return "default"
+        return f"{self.engine.getProperty('voice')}:{self.engine.getProperty('rate')}:{self.engine.getProperty('volume')}"
+    
+    def _default_output_path(self) -> str:
+        """Generate a unique output path for a voiceover file"""
+        return f"output_videos/voiceover_{uuid.uuid4().hex[:8]}.mp3"
     
     def set_voice_speed(self, rate: int = 150):
         """Set the voice speaking rate (words per minute)"""
@@ -268,6 +379,8 @@ class VideoEditorTool:
 class AnimatedSlideGenerator:
     """Generate animated slides like Gamma with smooth transitions and effects"""
     
+    frame_size = (1920, 1080)
+    
     def __init__(self):
         self.logger = logging.getLogger("tool.animated_slides")
     
@@ -284,7 +397,7 @@ class AnimatedSlideGenerator:
         try:
             import cv2
             
-            width, height = 1920, 1080
+            width, height = self.frame_size
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
             out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
             
@@ -298,37 +411,9 @@ class AnimatedSlideGenerator:
                 return output_path
             
             frame_count = 0
-            for slide_idx, slide in enumerate(slides):
-                self.logger.info(f"Creating animated slide {slide_idx + 1}/{len(slides)}")
-                
-                duration = slide.get("duration", 5)
-                total_frames = duration * fps
-                transition_type = slide.get("transition", "fade")
-                
-                # Optimize: Use fewer intermediate frames for animations
-                # Generate key frames and interpolate
-                key_frame_steps = max(10, int(total_frames / 5))  # Sample every ~5 frames or at least 10 steps
-                
-                # Generate frames for this slide with animations
-                for frame_num in range(total_frames):
-                    # Calculate progress for smoother animations
-                    progress = frame_num / total_frames
-                    
-                    # Create base frame
-                    frame = self._create_slide_frame(
-                        slide,
-                        progress,
-                        frame_num,
-                        total_frames,
-                        transition_type
-                    )
-                    
-                    out.write(frame)
-                    frame_count += 1
-                    
-                    # Log progress every 30 frames
-                    if frame_count % 30 == 0:
-                        self.logger.debug(f"Rendered {frame_count} frames")
+            for frame in self.iter_frames(slides, fps):
+                out.write(frame)
+                frame_count += 1
             
             out.release()
             self.logger.info(f"Animated video created: {output_path} ({frame_count} frames)")
@@ -337,10 +422,34 @@ class AnimatedSlideGenerator:
         except Exception as e:
             self.logger.error(f"Failed to create animated video: {e}")
             raise
-            
-        except Exception as e:
-            self.logger.error(f"Failed to create animated video: {e}")
-            raise
+    
+    def iter_frames(self, slides: List[Dict], fps: int = 30) -> Iterator[np.ndarray]:
+        """Yield the BGR frames of the animated slides in playback order"""
+        frame_count = 0
+        for slide_idx, slide in enumerate(slides):
+            self.logger.info(f"Creating animated slide {slide_idx + 1}/{len(slides)}")
+            
+            duration = slide.get("duration", 5)
+            total_frames = duration * fps
+            transition_type = slide.get("transition", "fade")
+            
+            # Generate frames for this slide with animations
+            for frame_num in range(total_frames):
+                # Calculate progress for smoother animations
+                progress = frame_num / total_frames
+                
+                yield self._create_slide_frame(
+                    slide,
+                    progress,
+                    frame_num,
+                    total_frames,
+                    transition_type
+                )
+                frame_count += 1
+                
+                # Log progress every 30 frames
+                if frame_count % 30 == 0:
+                    self.logger.debug(f"Rendered {frame_count} frames")
     
     def _create_slide_frame(self, slide: Dict, progress: float, frame_num: int, total_frames: int, transition: str) -> np.ndarray:
         """Create single animated frame for a slide"""
@@ -607,9 +716,10 @@ class ThumbnailGeneratorTool:
             
             filename = f"thumbnail_{hash(title) % 10000}.jpg"
             
-            # Simulate thumbnail creation
-            with open(filename, "w") as f:
-                f.write("Simulated thumbnail")
+            # Simulate thumbnail creation without blocking the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, _write_placeholder, filename, "Simulated thumbnail"
+            )
             
             return filename
             
@@ -1,5 +1,7 @@
 import json
-from typing import Dict, Any, List
+import asyncio
+import contextlib
+from typing import AsyncIterator, Dict, Any, List, Optional
 import logging
 from pydantic import BaseModel
 
@@ -8,6 +10,11 @@ try:
 except ImportError:
     aiohttp = None
 
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write a file in one call (run off the event loop)"""
+    with open(path, 'wb') as f:
+        f.write(data)
+
 class OpenAPIClient(BaseModel):
     """Generic OpenAPI client"""
     base_url: str
@@ -144,7 +151,12 @@ class PexelsAPITool:
             return {"error": f"Pexels API error: {str(e)}"}
 
 class ElevenLabsAPITool:
-    """ElevenLabs API for voice synthesis"""
+    """
+    ElevenLabs API for voice synthesis
+    
+    Use as an async context manager to keep one warmed, pooled session open
+    for a run of requests; outside one, each request opens and closes its own.
+    """
     
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -154,6 +166,48 @@ class ElevenLabsAPITool:
             "Content-Type": "application/json"
         }
         self.logger = logging.getLogger("tool.elevenlabs_api")
+        self._session: Optional["aiohttp.ClientSession"] = None
+    
+    async def __aenter__(self) -> "ElevenLabsAPITool":
+        await self.preconnect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Shared keep-alive session, so TLS handshakes are paid once per tool"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=16, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        return self._session
+    
+    @contextlib.asynccontextmanager
+    async def _request_session(self) -> AsyncIterator["aiohttp.ClientSession"]:
+        """The shared session while one is open, else a one-shot session closed after use"""
+        if self._session is not None and not self._session.closed:
+            yield self._session
+        else:
+            async with aiohttp.ClientSession(headers=self.headers) as session:
+                yield session
+    
+    async def preconnect(self):
+        """Open the shared session and a pooled connection ahead of the first
+        synthesis request; pair with close() (or use the tool with async with)"""
+        if aiohttp is None:
+            return
+        
+        try:
+            async with self._get_session().head(self.base_url) as response:
+                self.logger.debug(f"ElevenLabs preconnect: {response.status}")
+        except Exception as e:
+            self.logger.debug(f"ElevenLabs preconnect failed: {str(e)}")
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def text_to_speech(self, text: str, voice_id: str = "21m00Tcm4TlvDq8ikWAM") -> Dict[str, Any]:
         """Convert text to speech"""
@@ -161,44 +215,44 @@ class ElevenLabsAPITool:
             return {"error": "aiohttp not installed. Install with: pip install aiohttp"}
             
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                payload = {
-                    "text": text,
-                    "model_id": "eleven_monolingual_v1",
-                    "voice_settings": {
-                        "stability": 0.5,
-                        "similarity_boost": 0.5
-                    }
+            payload = {
+                "text": text,
+                "model_id": "eleven_monolingual_v1",
+                "voice_settings": {
+                    "stability": 0.5,
+                    "similarity_boost": 0.5
                 }
+            }
+            
+            async with self._request_session() as session, session.post(
+                f"{self.base_url}/text-to-speech/{voice_id}",
+                json=payload
+            ) as response:
                 
-                async with session.post(
-                    f"{self.base_url}/text-to-speech/{voice_id}",
-                    json=payload
-                ) as response:
+                if response.status == 200:
+                    audio_data = await response.read()
                     
-                    if response.status == 200:
-                        audio_data = await response.read()
-                        
-                        # Save audio file
-                        filename = f"elevenlabs_{hash(text) % 10000}.mp3"
-                        with open(filename, 'wb') as f:
-                            f.write(audio_data)
-                        
-                        self.logger.info(f"Generated speech for {len(text)} characters")
-                        return {
-                            "success": True,
-                            "audio_file": filename,
-                            "voice_id": voice_id,
-                            "text_length": len(text)
-                        }
-                    else:
-                        error_data = await response.text()
-                        self.logger.error(f"ElevenLabs API error: {response.status} - {error_data}")
-                        return {
-                            "success": False,
-                            "error": f"API error: {response.status}",
-                            "details": error_data
-                        }
+                    # Save audio file
+                    filename = f"elevenlabs_{hash(text) % 10000}.mp3"
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, _write_bytes, filename, audio_data
+                    )
+                    
+                    self.logger.info(f"Generated speech for {len(text)} characters")
+                    return {
+                        "success": True,
+                        "audio_file": filename,
+                        "voice_id": voice_id,
+                        "text_length": len(text)
+                    }
+                else:
+                    error_data = await response.text()
+                    self.logger.error(f"ElevenLabs API error: {response.status} - {error_data}")
+                    return {
+                        "success": False,
+                        "error": f"API error: {response.status}",
+                        "details": error_data
+                    }
                         
         except Exception as e:
             self.logger.error(f"ElevenLabs TTS failed: {str(e)}")
@@ -213,13 +267,12 @@ class ElevenLabsAPITool:
             return {"error": "aiohttp not installed. Install with: pip install aiohttp"}
             
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(f"{self.base_url}/voices") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {"voices": data.get('voices', [])}
-                    else:
-                        return {"error": f"API error: {response.status}"}
+            async with self._request_session() as session, session.get(f"{self.base_url}/voices") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {"voices": data.get('voices', [])}
+                else:
+                    return {"error": f"API error: {response.status}"}
         except Exception as e:
             self.logger.error(f"Failed to get voices: {str(e)}")
             return {"error": str(e)}
\ No newline at end of file